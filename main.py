@@ -18,367 +18,2681 @@
 #
 
 
+import datetime
+import importlib.util
+import math
 import os.path
-import subprocess
+import re
+import sqlite3
+import threading
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from sys import argv, exit
+from time import perf_counter, strftime
+
+# Time at which the app started, for the startup timing report.
+STARTUP_TIME = perf_counter()
+
+# The storage engine keeps all the data of the app.
+#   1. "mysql" keeps the data on the MySQL Server described by MYSQL_SERVER.
+#   2. "sqlite" keeps the data in a file inside SQLITE_FOLDER_PATH and needs no server at all.
+STORAGE_ENGINE = os.environ.get("PAPER_STORAGE_ENGINE", "mysql")
+MYSQL_SERVER = {
+    "host": "localhost",
+    "user": "root",
+    "password": "password"
+}
+SQLITE_FOLDER_PATH = os.path.join(os.path.expanduser("~"), "Documents", "Paper", "Data")
+
+# Snapshots of all the data are kept inside BACKUP_FOLDER_PATH. Only the newest BACKUP_SNAPSHOT_COUNT
+# snapshots are kept, the older ones are removed. A snapshot renamed by keep_snapshot() is never removed.
+BACKUP_FOLDER_PATH = os.path.join(os.path.expanduser("~"), "Documents", "Paper", "Backups")
+BACKUP_SNAPSHOT_COUNT = 5
+
+# Attendance records are exported inside EXPORT_FOLDER_PATH.
+EXPORT_FOLDER_PATH = os.path.join(os.path.expanduser("~"), "Documents", "Paper", "Attendance Records")
+
+# Number of days between automatic backups for each "backup frequency" setting: daily, weekly and monthly.
+BACKUP_FREQUENCY_DAYS = (1, 7, 30)
+
+# Periods the attendance is reported for on the "Period Report", in the order of the period selector.
+# A week starts on Monday, and a school year has a term starting in each of TERM_START_MONTHS.
+REPORT_PERIODS = ("week", "month", "term")
+TERM_START_MONTHS = (4, 10)
+
+# If set, the number of statements run while setting up each screen is printed.
+PROFILE_QUERIES = os.environ.get("PAPER_PROFILE_QUERIES") is not None
+
+# If set, the time taken to start the app, set up each screen and build each window is printed.
+PROFILE_TIMING = os.environ.get("PAPER_PROFILE_TIMING") is not None
+
+# The .ui files inside "src/layout" are compiled into Python modules kept inside UI_CACHE_FOLDER_PATH.
+# A module is compiled again only when its .ui file changes.
+UI_CACHE_FOLDER_PATH = os.path.join("src", "layout", "__uicache__")
+
+# Modules needed only by some screens or dialogs are imported when they are first used, not here, to keep
+# the start of the app fast:
+#   1. pyqtgraph, when the "Attendance Chart" is first shown.
+#   2. PyQt6.uic, when a .ui file has to be compiled.
+#   3. csv, gzip, json and subprocess, when data is exported, backed up or restored.
+# "python profile_imports.py" prints the time taken to import this module, by module.
+try:
+    from PyQt6 import QtWidgets, QtCore, QtGui
+
+    # pyqtgraph is only looked for here, so that the app does not start without it.
+    if importlib.util.find_spec("pyqtgraph") is None:
+        raise ImportError("No module named 'pyqtgraph'")
+
+    # mysql.connector is needed only when the data is kept on the MySQL Server.
+    if STORAGE_ENGINE == "mysql":
+        import mysql.connector as server
+
+except ImportError:
+    from tkinter import Tk, messagebox
+
+    root = Tk()
+    root.attributes("-topmost", True)
+    root.overrideredirect(True)
+    root.withdraw()
+
+    messagebox.showerror(title="Paper - Cannot run app",
+                         message="One or all of the following modules required to run the app were not found:\n\n"
+                                 "PyQt6\n"
+                                 "pyqtgraph\n"
+                                 "mysql.connector\n\n"
+                                 "If Python is added to Path, type: pip install <module> in your terminal " \
+                                 "to install the modules.")
+    exit()
+
+
+class DatabaseError(Exception):
+    """Raised when the storage engine fails to carry out a statement."""
+
+
+class ProgrammingError(DatabaseError):
+    """Raised when a statement refers to a database or table which does not exist, or creates one which exists."""
+
+
+class IntegrityError(DatabaseError):
+    """Raised when a statement would store a duplicate key."""
+
+
+class DataCursor:
+    """
+    Cursor through which the app runs all its statements, whatever the storage engine is.
+    Statements are written with "%s" placeholders, and the errors of the storage engine
+    are raised as DatabaseError, ProgrammingError or IntegrityError.
+    A single DataCursor is shared by the whole app: the statements of every thread run on the
+    connection which the storage engine has handed to that thread.
+    """
+
+    def __init__(self, engine):
+        self._engine = engine
+
+    def _run(self, method: str, query: str, parameters):
+        """
+        Helper function for execute() and executemany().
+        If the connection turns out to be lost, it is opened again and the statement is run once more.
+
+        :param method: Name of the method of the engine's cursor to call.
+        :param query: The statement to run.
+        :param parameters: Values for the placeholders in the statement.
+        """
+        query = self._engine.prepare_query(query)
+        self._engine.query_count += 1
+
+        try:
+            self._engine.run_statement(method, query, parameters)
+        except self._engine.engine_error() as error:
+            if not self._engine.can_reconnect(error):
+                raise self._engine.translate_error(error) from error
+
+            self._engine.reconnect()
+
+            try:
+                self._engine.run_statement(method, query, parameters)
+            except self._engine.engine_error() as error:
+                raise self._engine.translate_error(error) from error
+
+    def execute(self, query: str, parameters: tuple = ()):
+        """
+        Runs a statement.
+
+        :param query: The statement to run.
+        :param parameters: Values for the placeholders in the statement.
+        """
+        self._run("execute", query, parameters)
+
+    def executemany(self, query: str, parameters: list):
+        """
+        Runs a statement once for every set of values.
+
+        :param query: The statement to run.
+        :param parameters: List of values for the placeholders in the statement.
+        """
+        self._run("executemany", query, parameters)
+
+    def stream(self, query: str, parameters: tuple = ()):
+        """
+        Runs a statement which reads a lot of rows, to be read in batches with fetchmany() as they arrive
+        instead of all at once. The statement is not prepared.
+
+        :param query: The statement to run.
+        :param parameters: Values for the placeholders in the statement.
+        """
+        self._run("stream", query, parameters)
+
+    def fetchone(self) -> tuple or None:
+        """
+        Gets the next row of the result.
+
+        :return: The next row, if available, else None.
+        """
+        return self._engine.get_result().fetchone()
+
+    def fetchmany(self, size: int) -> list:
+        """
+        Gets the next batch of rows of the result.
+
+        :param size: Maximum number of rows in the batch.
+        :return: List of rows, which is empty when no rows are left.
+        """
+        return self._engine.get_result().fetchmany(size)
+
+    def fetchall(self) -> list:
+        """
+        Gets all the remaining rows of the result.
+
+        :return: List of rows.
+        """
+        return self._engine.get_result().fetchall()
+
+
+class BufferedResult:
+    """Rows of a result which were read from the storage engine all at once."""
+
+    def __init__(self, rows: list):
+        self._rows = rows
+        self._position = 0
+
+    def fetchone(self) -> tuple or None:
+        """
+        Gets the next row of the result.
+
+        :return: The next row, if available, else None.
+        """
+        if self._position == len(self._rows):
+            return None
+
+        self._position += 1
+        return self._rows[self._position - 1]
+
+    def fetchmany(self, size: int) -> list:
+        """
+        Gets the next batch of rows of the result.
+
+        :param size: Maximum number of rows in the batch.
+        :return: List of rows, which is empty when no rows are left.
+        """
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+
+        return rows
+
+    def fetchall(self) -> list:
+        """
+        Gets all the remaining rows of the result.
+
+        :return: List of rows.
+        """
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+
+        return rows
+
+
+class PooledConnection:
+    """A connection of the storage engine's own database module, as kept by the ConnectionPool."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = None
+
+        # Prepared statements of the connection, mapped to the cursor each one was prepared on.
+        self.prepared_cursors = dict()
+
+        # The cursor or BufferedResult holding the result of the last statement.
+        self.result = None
+
+
+class ConnectionPool:
+    """
+    Keeps idle connections to the storage engine for reuse.
+    Connections are opened only when they are needed, and are checked before being handed out.
+    """
+
+    def __init__(self, engine, size: int):
+        self._engine = engine
+        self._size = size
+        self._idle = list()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> PooledConnection:
+        """
+        Hands out a healthy connection, opening a new one if no idle connection is left.
+
+        :return: The connection.
+        """
+        while True:
+            with self._lock:
+                pooled_connection = self._idle.pop() if self._idle else None
+
+            if pooled_connection is None:
+                return PooledConnection(self._engine.open_connection())
+
+            if self._engine.check_connection(pooled_connection.connection):
+                return pooled_connection
+
+            # The connection is broken. Throw it away and try the next one.
+            self.discard(pooled_connection)
+
+    def release(self, pooled_connection: PooledConnection):
+        """
+        Takes a connection back. It is kept for reuse if the pool is not full, else it is closed.
+
+        :param pooled_connection: The connection handed out by acquire().
+        """
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append(pooled_connection)
+                return
+
+        self.discard(pooled_connection)
+
+    def discard(self, pooled_connection: PooledConnection):
+        """
+        Closes a connection for good.
+
+        :param pooled_connection: The connection to close.
+        """
+        try:
+            pooled_connection.connection.close()
+        except self._engine.engine_error():
+            pass
+
+    def clear(self):
+        """Closes all the idle connections."""
+        with self._lock:
+            idle_connections = self._idle
+            self._idle = list()
+
+        for pooled_connection in idle_connections:
+            self.discard(pooled_connection)
+
+
+class StorageEngine:
+    """
+    Base class of the storage engines.
+    Every database of the app, like "paper_information_database", is a database on the engine.
+
+    Connections come from a ConnectionPool and are handed to threads. A thread which runs a
+    statement without a connection, like the UI thread, keeps the connection it gets for its
+    whole life. Background work runs inside connection(), which lends it a connection of its own.
+    """
+
+    # Column definition of an integer primary key which is generated on insert.
+    AUTO_INCREMENT_KEY = None
+
+    # Maximum number of idle connections kept for reuse.
+    POOL_SIZE = 4
+
+    # Kinds of statements which are prepared once per connection and then reused with new values.
+    PREPARED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+    def __init__(self):
+        self._pool = ConnectionPool(self, self.POOL_SIZE)
+        self._thread_data = threading.local()
+
+        # Number of statements sent to the engine, used for profiling.
+        self.query_count = 0
+
+        # Names of the databases that exist, loaded on first use and then kept up to date by
+        # create_database() and drop_database().
+        self._databases = None
+
+    def open_connection(self):
+        """
+        Opens a new connection to the storage engine.
+
+        :return: The connection of the engine's own database module.
+        """
+        raise NotImplementedError
+
+    def check_connection(self, connection) -> bool:
+        """
+        Tells whether an idle connection can still be used.
+
+        :param connection: The connection of the engine's own database module.
+        :return: True if the connection works, else False.
+        """
+        return True
+
+    def new_cursor(self, connection):
+        """
+        Opens a cursor of the storage engine.
+
+        :param connection: The connection of the engine's own database module.
+        :return: The cursor of the engine's own database module.
+        """
+        return connection.cursor()
+
+    def _get_pooled_connection(self) -> PooledConnection:
+        """
+        Helper function for getting the connection handed to the calling thread.
+        If the thread has none, a connection is acquired and kept by the thread.
+
+        :return: The connection of the calling thread.
+        """
+        pooled_connection = getattr(self._thread_data, "connection", None)
+        if pooled_connection is None:
+            pooled_connection = self._pool.acquire()
+            self._thread_data.connection = pooled_connection
+            self._thread_data.in_transaction = False
+
+        return pooled_connection
+
+    def get_engine_cursor(self):
+        """
+        Gets the cursor of the connection handed to the calling thread.
+
+        :return: The cursor of the engine's own database module.
+        """
+        pooled_connection = self._get_pooled_connection()
+        if pooled_connection.cursor is None:
+            pooled_connection.cursor = self.new_cursor(pooled_connection.connection)
+
+        return pooled_connection.cursor
+
+    def run_statement(self, method: str, query: str, parameters):
+        """
+        Runs a statement on the connection handed to the calling thread.
+        Single statements that read or write rows are prepared. executemany() uses the plain cursor,
+        as it can send all the sets of values in one round trip.
+
+        :param method: "execute", "executemany" or "stream".
+        :param query: The statement, converted by prepare_query().
+        :param parameters: Values for the placeholders in the statement.
+        """
+        pooled_connection = self._get_pooled_connection()
+
+        if method == "stream":
+            pooled_connection.result = self.execute_streamed(pooled_connection, query, parameters)
+        elif method == "execute" and query.lstrip().upper().startswith(self.PREPARED_STATEMENTS):
+            pooled_connection.result = self.execute_prepared(pooled_connection, query, parameters)
+        else:
+            cursor = self.get_engine_cursor()
+            getattr(cursor, method)(query, parameters)
+            pooled_connection.result = cursor
+
+    def execute_prepared(self, pooled_connection: PooledConnection, query: str, parameters: tuple):
+        """
+        Runs a statement which the engine parses once per connection.
+
+        :param pooled_connection: The connection to run the statement on.
+        :param query: The statement, converted by prepare_query().
+        :param parameters: Values for the placeholders in the statement.
+        :return: The cursor or BufferedResult holding the result.
+        """
+        cursor = self.get_engine_cursor()
+        cursor.execute(query, parameters)
+
+        return cursor
+
+    def execute_streamed(self, pooled_connection: PooledConnection, query: str, parameters: tuple):
+        """
+        Runs a statement whose rows are handed out as they are read from the engine.
+
+        :param pooled_connection: The connection to run the statement on.
+        :param query: The statement, converted by prepare_query().
+        :param parameters: Values for the placeholders in the statement.
+        :return: The cursor holding the result.
+        """
+        cursor = self.get_engine_cursor()
+        cursor.execute(query, parameters)
+
+        return cursor
+
+    def get_result(self):
+        """
+        Gets the result of the last statement run by the calling thread.
+
+        :return: The cursor or BufferedResult holding the result.
+        """
+        return self._get_pooled_connection().result
+
+    @contextmanager
+    def connection(self):
+        """
+        Lends a connection of its own to the calling thread for the duration of the block.
+        If the thread already has a connection, it keeps using it.
+
+        :return: The cursor for running statements on the connection.
+        """
+        if getattr(self._thread_data, "connection", None) is not None:
+            yield self.cursor()
+            return
+
+        self._thread_data.connection = self._pool.acquire()
+        self._thread_data.in_transaction = False
+
+        try:
+            yield self.cursor()
+        finally:
+            if self._thread_data.in_transaction:
+                self.rollback()
+
+            pooled_connection = self._thread_data.connection
+            self._thread_data.connection = None
+
+            self._pool.release(pooled_connection)
+
+    def can_reconnect(self, error: Exception) -> bool:
+        """
+        Tells whether a statement that failed with the provided error should be run again on a new connection.
+        Statements inside a transaction are never run again, as the rest of the transaction is lost.
+
+        :param error: The error raised by the engine.
+        :return: True if the connection was lost outside a transaction, else False.
+        """
+        return self.is_connection_lost(error) and not getattr(self._thread_data, "in_transaction", False)
+
+    def is_connection_lost(self, error: Exception) -> bool:
+        """
+        Tells whether an error was raised because the connection was lost.
+
+        :param error: The error raised by the engine.
+        :return: True if the connection was lost, else False.
+        """
+        return False
+
+    def reconnect(self):
+        """Replaces the connection of the calling thread with a new one."""
+        self._pool.discard(self._thread_data.connection)
+        self._thread_data.connection = PooledConnection(self.open_connection())
+
+    def cursor(self) -> DataCursor:
+        """
+        Makes a cursor for running statements on the storage engine.
+
+        :return: A new cursor.
+        """
+        return DataCursor(self)
+
+    def engine_error(self) -> type:
+        """
+        Tells the base class of the errors raised by the engine's own database module.
+
+        :return: The base class of the errors.
+        """
+        raise NotImplementedError
+
+    def translate_error(self, error: Exception) -> DatabaseError:
+        """
+        Converts an error raised by the engine's own database module to an error of the app.
+
+        :param error: The error raised by the engine.
+        :return: The corresponding DatabaseError, ProgrammingError or IntegrityError.
+        """
+        raise NotImplementedError
+
+    def prepare_query(self, query: str) -> str:
+        """
+        Converts a statement written for the app to the form understood by the engine.
+
+        :param query: The statement to convert.
+        :return: The converted statement.
+        """
+        return query
+
+    def load_database_list(self) -> set:
+        """
+        Finds all the databases that exist on the engine.
+
+        :return: Set of database names.
+        """
+        raise NotImplementedError
+
+    def _get_database_list(self) -> set:
+        """
+        Helper function for getting the names of the databases, loading them on first use.
+
+        :return: Set of database names.
+        """
+        if self._databases is None:
+            self._databases = self.load_database_list()
+
+        return self._databases
+
+    def _change_database_list(self, added: str = None, removed: str = None):
+        """
+        Helper function for recording a database that was created or dropped.
+
+        :param added: Name of the created database.
+        :param removed: Name of the dropped database.
+        """
+        if added is not None:
+            self._get_database_list().add(added)
+        if removed is not None:
+            self._get_database_list().discard(removed)
+
+    def has_database(self, database: str) -> bool:
+        """
+        Tells whether a database exists.
+        Tables are always referred to as "database.table", so no working database is ever set.
+
+        :param database: Name of the database.
+        :return: True if the database exists, else False.
+        """
+        return database in self._get_database_list()
+
+    def create_database(self, database: str):
+        """
+        Creates a database. Raises DatabaseError if the database exists.
+
+        :param database: Name of the database.
+        """
+        raise NotImplementedError
+
+    def drop_database(self, database: str):
+        """
+        Deletes a database along with all its tables. Raises DatabaseError if the database does not exist.
+
+        :param database: Name of the database.
+        """
+        raise NotImplementedError
+
+    def get_table_list(self, database: str) -> list:
+        """
+        Prepares list of all the tables present inside a database.
+
+        :param database: Name of the database.
+        :return: List of tables.
+        """
+        raise NotImplementedError
+
+    def get_column_list(self, database: str, table: str) -> list:
+        """
+        Prepares list of all the columns of a table.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :return: List of columns.
+        """
+        raise NotImplementedError
+
+    def rename_table(self, database: str, table: str, new_table: str):
+        """
+        Renames a table, keeping it inside its database.
+
+        :param database: Name of the database.
+        :param table: Current name of the table.
+        :param new_table: New name of the table.
+        """
+        raise NotImplementedError
+
+    def upsert_query(self, table: str, columns: list, key: str or list, accumulate: bool = False) -> str:
+        """
+        Prepares a statement which inserts a row, or updates the existing row with the same key.
+
+        :param table: Table to write to.
+        :param columns: Columns being written, including the key.
+        :param key: The key column, or the list of key columns.
+        :param accumulate: If True, the values are added to the values of the existing row
+                           instead of replacing them.
+        :return: The statement, with a placeholder for every column.
+        """
+        raise NotImplementedError
+
+    def start_transaction(self):
+        """Starts a transaction. Statements run till commit() or rollback() are applied together."""
+        self._get_pooled_connection()
+        self._thread_data.in_transaction = True
+
+    def commit(self):
+        """Applies all the statements run since start_transaction()."""
+        self._thread_data.in_transaction = False
+
+    def rollback(self):
+        """Undoes all the statements run since start_transaction()."""
+        self._thread_data.in_transaction = False
+
+
+class MySQLStorageEngine(StorageEngine):
+    """Keeps the data of the app on a MySQL Server."""
+
+    AUTO_INCREMENT_KEY = "int AUTO_INCREMENT PRIMARY KEY"
+
+    # Error numbers of the MySQL client which mean that the connection to the server was lost.
+    CONNECTION_LOST_ERRORS = (2006, 2013, 2055)
+
+    # Maximum number of prepared statements kept on a connection.
+    PREPARED_CURSOR_LIMIT = 64
+
+    def __init__(self, **connection_arguments):
+        super().__init__()
+        self._connection_arguments = connection_arguments
+
+    def open_connection(self):
+        # consume_results lets a statement run while the rows of a streamed statement are left unread,
+        # like when an export is cancelled. The rest of the rows are read and thrown away first.
+        connection = server.connect(**self._connection_arguments, consume_results=True)
+        connection.autocommit = True
+
+        return connection
+
+    def check_connection(self, connection) -> bool:
+        return connection.is_connected()
+
+    def new_cursor(self, connection):
+        return connection.cursor(buffered=True)
+
+    def execute_prepared(self, pooled_connection: PooledConnection, query: str, parameters: tuple):
+        # Every statement gets a cursor of its own, as a prepared cursor keeps only the last
+        # statement it prepared. So the server parses each statement once per connection.
+        # The cursors are kept in the order their statements were last run. Once PREPARED_CURSOR_LIMIT
+        # cursors are kept, the least recently used one is closed to make room, so that statements run
+        # only once, like those naming the tables of a migration, do not pile up on the server.
+        prepared_cursors = pooled_connection.prepared_cursors
+
+        cursor = prepared_cursors.pop(query, None)
+        if cursor is None:
+            if len(prepared_cursors) >= self.PREPARED_CURSOR_LIMIT:
+                prepared_cursors.pop(next(iter(prepared_cursors))).close()
+
+            cursor = pooled_connection.connection.cursor(prepared=True)
+
+        prepared_cursors[query] = cursor
+
+        cursor.execute(query, parameters)
+
+        # Read the whole result right away, as the connection can not run another statement
+        # while a prepared statement has unread rows.
+        if cursor.description is not None:
+            return BufferedResult(cursor.fetchall())
+        else:
+            return BufferedResult(list())
+
+    def execute_streamed(self, pooled_connection: PooledConnection, query: str, parameters: tuple):
+        # An unbuffered cursor of its own hands out the rows as they arrive from the server,
+        # where the cursors of the connection would read the whole result first.
+        cursor = pooled_connection.connection.cursor(buffered=False)
+        cursor.execute(query, parameters)
+
+        return cursor
+
+    def engine_error(self) -> type:
+        return server.Error
+
+    def translate_error(self, error: Exception) -> DatabaseError:
+        if isinstance(error, server.IntegrityError):
+            return IntegrityError(str(error))
+        elif isinstance(error, server.ProgrammingError):
+            return ProgrammingError(str(error))
+        else:
+            return DatabaseError(str(error))
+
+    def is_connection_lost(self, error: Exception) -> bool:
+        return error.errno in self.CONNECTION_LOST_ERRORS
+
+    def load_database_list(self) -> set:
+        cursor = self.cursor()
+        cursor.execute("SHOW DATABASES")
+
+        return set(database[0] for database in cursor.fetchall())
+
+    def create_database(self, database: str):
+        self.cursor().execute(f"CREATE DATABASE {database}")
+        self._change_database_list(added=database)
+
+    def drop_database(self, database: str):
+        self.cursor().execute(f"DROP DATABASE {database}")
+        self._change_database_list(removed=database)
+
+    def get_table_list(self, database: str) -> list:
+        cursor = self.cursor()
+        cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = %s", (database,))
+
+        return [table[0] for table in cursor.fetchall()]
+
+    def get_column_list(self, database: str, table: str) -> list:
+        cursor = self.cursor()
+        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_schema = %s AND table_name = %s",
+                       (database, table))
+
+        return [column[0] for column in cursor.fetchall()]
+
+    def rename_table(self, database: str, table: str, new_table: str):
+        self.cursor().execute(f"RENAME TABLE {database}.{table} TO {database}.{new_table}")
+
+    def upsert_query(self, table: str, columns: list, key: str or list, accumulate: bool = False) -> str:
+        keys = [key] if isinstance(key, str) else key
+
+        if accumulate:
+            updates = [f"{column} = {column} + VALUES({column})" for column in columns if column not in keys]
+        else:
+            updates = [f"{column} = VALUES({column})" for column in columns if column not in keys]
+
+        return f"INSERT INTO {table} ({', '.join(columns)}) " \
+               f"VALUES ({', '.join(['%s'] * len(columns))}) " \
+               f"ON DUPLICATE KEY UPDATE {', '.join(updates)}"
+
+    def start_transaction(self):
+        super().start_transaction()
+        self._get_pooled_connection().connection.start_transaction()
+
+    def commit(self):
+        super().commit()
+        self._get_pooled_connection().connection.commit()
+
+    def rollback(self):
+        super().rollback()
+        self._get_pooled_connection().connection.rollback()
+
+
+class SQLiteStorageEngine(StorageEngine):
+    """
+    Keeps the data of the app in a single SQLite file inside the provided folder, in WAL mode.
+    The engine runs inside the app, so no server is needed and statements do not leave the process.
+    Every database of the app is a set of tables in the file, named "<database>__<table>", and the names
+    of the databases are listed in "database_list". Keeping them in one file lets a transaction writing to
+    several databases be committed at once: SQLite does not commit atomically across attached files in WAL mode.
+    """
+
+    AUTO_INCREMENT_KEY = "integer PRIMARY KEY AUTOINCREMENT"
+
+    # Beginnings of the messages of SQLite which mean that a statement refers to a table or column
+    # which does not exist. Messages ending with " already exists" are ProgrammingError too.
+    PROGRAMMING_ERRORS = ("no such table", "no such column")
+
+    # Name of the file holding all the databases.
+    FILE_NAME = "paper.db"
+
+    # A table referred to as "database.table", or as "database.`table`". All the databases of the app
+    # are named "<name>_database".
+    QUALIFIED_TABLE_NAME = re.compile(r"\b(\w+_database)\.(?:`([^`]+)`|(\w+))")
+
+    def __init__(self, folder_path: str):
+        super().__init__()
+        self._folder_path = folder_path
+
+    def open_connection(self):
+        if not os.path.exists(self._folder_path):
+            os.makedirs(self._folder_path)
+
+        # isolation_level=None keeps every statement in its own transaction, unless
+        # start_transaction() is called.
+        # check_same_thread=False lets the pool hand the connection to another thread later on.
+        # SQLite keeps the statements it has parsed in a per-connection cache, keyed by the
+        # statement text. Parameterized statements stay the same text, so each one is parsed only once.
+        connection = sqlite3.connect(os.path.join(self._folder_path, self.FILE_NAME), isolation_level=None,
+                                     check_same_thread=False, cached_statements=256)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS database_list (name varchar(64) PRIMARY KEY)")
+
+        return connection
+
+    def engine_error(self) -> type:
+        return sqlite3.Error
+
+    def translate_error(self, error: Exception) -> DatabaseError:
+        if isinstance(error, sqlite3.IntegrityError):
+            return IntegrityError(str(error))
+        # SQLite reports missing and existing tables as operational errors, along with errors like
+        # a locked database or a full disk. Only the former are ProgrammingError.
+        elif isinstance(error, sqlite3.OperationalError) and \
+                (str(error).startswith(self.PROGRAMMING_ERRORS) or str(error).endswith(" already exists")):
+            return ProgrammingError(str(error))
+        else:
+            return DatabaseError(str(error))
+
+    def prepare_query(self, query: str) -> str:
+        query = self.QUALIFIED_TABLE_NAME.sub(lambda match: f'"{match[1]}__{match[2] or match[3]}"', query)
+        return query.replace("%s", "?")
+
+    def load_database_list(self) -> set:
+        cursor = self.cursor()
+        cursor.execute("SELECT name FROM database_list")
+
+        return set(database[0] for database in cursor.fetchall())
+
+    def create_database(self, database: str):
+        if self.has_database(database):
+            raise DatabaseError(f"Can't create database '{database}'; database exists")
+
+        self.cursor().execute("INSERT INTO database_list (name) VALUES (%s)", (database,))
+        self._change_database_list(added=database)
+
+    def drop_database(self, database: str):
+        if not self.has_database(database):
+            raise DatabaseError(f"Can't drop database '{database}'; database doesn't exist")
+
+        cursor = self.cursor()
+        tables = self.get_table_list(database)
+
+        # The tables of the database are dropped along with its name, all at once.
+        self.start_transaction()
+        try:
+            for table in tables:
+                cursor.execute(f"DROP TABLE {database}.{table}")
+
+            cursor.execute("DELETE FROM database_list WHERE name = %s", (database,))
+
+        # If an error occurs, keep the database as it was and let the error propagate.
+        except DatabaseError:
+            self.rollback()
+            raise
+
+        self.commit()
+        self._change_database_list(removed=database)
+
+    def get_table_list(self, database: str) -> list:
+        cursor = self.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB %s", (database + "__*",))
+
+        return [table[0][len(database) + 2:] for table in cursor.fetchall()]
+
+    def get_column_list(self, database: str, table: str) -> list:
+        cursor = self.cursor()
+        cursor.execute("SELECT name FROM pragma_table_info(%s)", (f"{database}__{table}",))
+
+        return [column[0] for column in cursor.fetchall()]
+
+    def rename_table(self, database: str, table: str, new_table: str):
+        self.cursor().execute(f"ALTER TABLE {database}.{table} RENAME TO {database}.{new_table}")
+
+    def upsert_query(self, table: str, columns: list, key: str or list, accumulate: bool = False) -> str:
+        keys = [key] if isinstance(key, str) else key
+
+        if accumulate:
+            updates = [f"{column} = {column} + excluded.{column}" for column in columns if column not in keys]
+        else:
+            updates = [f"{column} = excluded.{column}" for column in columns if column not in keys]
+
+        return f"INSERT INTO {table} ({', '.join(columns)}) " \
+               f"VALUES ({', '.join(['%s'] * len(columns))}) " \
+               f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {', '.join(updates)}"
+
+    def start_transaction(self):
+        super().start_transaction()
+        self.cursor().execute("BEGIN")
+
+    def commit(self):
+        super().commit()
+        self.cursor().execute("COMMIT")
+
+    def rollback(self):
+        super().rollback()
+        self.cursor().execute("ROLLBACK")
+
+
+def create_storage_engine(engine: str) -> StorageEngine:
+    """
+    Prepares the storage engine chosen to keep the data of the app.
+    No connection is opened till the first statement is run.
+
+    :param engine: Name of the storage engine, "mysql" or "sqlite".
+    :return: The storage engine.
+    """
+    if engine == "sqlite":
+        return SQLiteStorageEngine(SQLITE_FOLDER_PATH)
+    else:
+        return MySQLStorageEngine(**MYSQL_SERVER)
+
+
+data_storage = create_storage_engine(STORAGE_ENGINE)
+data_cursor = data_storage.cursor()
+
+
+@contextmanager
+def count_queries(task: str):
+    """
+    Counts the statements run inside the block and prints the count if PROFILE_QUERIES is set.
+
+    :param task: Name of the task being profiled.
+    """
+    query_count = data_storage.query_count
+    yield
+
+    if PROFILE_QUERIES:
+        print(f"{task}: {data_storage.query_count - query_count} queries")
+
+
+@contextmanager
+def time_task(task: str):
+    """
+    Measures the time taken inside the block and prints it if PROFILE_TIMING is set.
+
+    :param task: Name of the task being timed.
+    """
+    start_time = perf_counter()
+    yield
+
+    if PROFILE_TIMING:
+        print(f"{task}: {(perf_counter() - start_time) * 1000:.1f} ms")
+
+
+# Copy of the PIN, the Class Name and the settings. It is filled from the database on first use and
+# changed along with the database by the functions which save these values, so reading them costs no query.
+configuration_cache = {}
+
+# Columns of "paper_settings_table" for every key of the dictionary returned by get_settings().
+SETTING_COLUMNS = {
+    "check present": "check_present",
+    "minimum attendance": "minimum_attendance",
+    "backup frequency": "backup_frequency",
+    "backup date": "backup_date"
+}
+
+
+def clear_configuration_cache():
+    """Forgets the cached configuration, so that it is read again from the database when needed."""
+    configuration_cache.clear()
+
+
+def create_information_database():
+    """Creates database to store all the information used by the app."""
+    data_storage.create_database("paper_information_database")
+
+
+def create_attendance_database():
+    """Creates database to store all the attendance records."""
+    data_storage.create_database("paper_attendance_database")
+
+
+def create_reports_database():
+    """Creates database to store all the attendance reports."""
+    data_storage.create_database("paper_reports_database")
+
+
+def create_data_table():
+    """Creates table to store the PIN and Class Name provided by the user."""
+    create_query = "CREATE TABLE paper_information_database.paper_data_table (" \
+                   "pin varchar(4), " \
+                   "class_name varchar(20)" \
+                   ")"
+    data_cursor.execute(create_query)
+
+
+def create_student_list_table(suffix: str = ""):
+    """
+    Creates table to store the name of all the students of a class.
+    Every student keeps their row, and their "id", after being removed from the class, as the attendance records
+    and the reports refer to the students by "id". A student removed from the class is no longer "enrolled".
+    The names of the students who are enrolled are kept unique by the app. A new student may have the name
+    of a student removed before, so the names are not unique in the table.
+
+    :param suffix: Added to the name of the table, to create the table written by a migration.
+    """
+    create_table_query = f"CREATE TABLE paper_information_database.paper_student_list_table{suffix} (" \
+                         f"id {data_storage.AUTO_INCREMENT_KEY}, " \
+                         "name varchar(40), " \
+                         "enrolled int(1)" \
+                         ")"
+    data_cursor.execute(create_table_query)
+
+
+def create_settings_table():
+    """Creates table to store all the setting values."""
+    create_query = "CREATE TABLE paper_information_database.paper_settings_table (" \
+                   "check_present varchar(1), " \
+                   "minimum_attendance int(3), " \
+                   "backup_frequency int(1), " \
+                   "backup_date date" \
+                   ")"
+    data_cursor.execute(create_query)
+
+    default_settings = {
+        "check present": "N",
+        "minimum attendance": 75,
+        "backup frequency": 2,
+        "backup date": get_date_after(30)
+    }
+
+    set_default_settings_query = "INSERT INTO paper_information_database.paper_settings_table " \
+                                 "VALUES (%s, %s, %s, %s)"
+    data_cursor.execute(set_default_settings_query, tuple(default_settings.values()))
+
+    configuration_cache["settings"] = default_settings
+
+
+def create_attendance_table(suffix: str = ""):
+    """
+    Creates table to store the attendance records of all the days.
+    Each row is the attendance state of one student on one date.
+
+    :param suffix: Added to the name of the table, to create the table written by a migration.
+    """
+    create_query = f"CREATE TABLE paper_attendance_database.paper_attendance_table{suffix} (" \
+                   "date varchar(10), " \
+                   "student_id int, " \
+                   "state varchar(1), " \
+                   "PRIMARY KEY (date, student_id), " \
+                   "UNIQUE (student_id, date)" \
+                   ")"
+    # The primary key serves lookups by date. The unique key indexes the student as well, so that the
+    # records of a student across all the dates can be found without scanning the whole table.
+    data_cursor.execute(create_query)
+
+
+def create_student_report_table(suffix: str = ""):
+    """
+    Creates table to store individual student attendance report.
+
+    :param suffix: Added to the name of the table, to create the table written by a migration.
+    """
+    create_query = f"CREATE TABLE paper_reports_database.paper_student_report_table{suffix} (" \
+                   "student_id int PRIMARY KEY, " \
+                   "total_days int(3), " \
+                   "days_present int(3)" \
+                   ")"
+    data_cursor.execute(create_query)
+
+
+def create_export_manifest_table():
+    """
+    Creates table to note the number of rows of every attendance record when it was last exported.
+    A record which has no row here has changed since it was last exported.
+    """
+    create_query = "CREATE TABLE paper_attendance_database.paper_export_manifest_table (" \
+                   "date varchar(10) PRIMARY KEY, " \
+                   "record_count int(4)" \
+                   ")"
+    data_cursor.execute(create_query)
+
+
+def create_daily_report_table(suffix: str = ""):
+    """
+    Creates table to store daily attendance report.
+    The reports are keyed by their date, kept in 'YYYY-MM-DD' format, so that the primary key
+    keeps them in the order of their dates and serves range queries.
+
+    :param suffix: Added to the name of the table, to create the table written by a migration.
+    """
+    create_query = f"CREATE TABLE paper_reports_database.paper_daily_report_table{suffix} (" \
+                   "date date PRIMARY KEY, " \
+                   "present int(3), " \
+                   "absent int(3), " \
+                   "attendance_percentage decimal(4, 1)" \
+                   ")"
+    data_cursor.execute(create_query)
+
+
+def create_period_report_table():
+    """
+    Creates table to store the attendance report of the class for every week, month and term.
+    Each row adds up the daily reports of the days recorded within one period, which starts on "period_start".
+    """
+    create_query = "CREATE TABLE paper_reports_database.paper_period_report_table (" \
+                   "period varchar(5), " \
+                   "period_start date, " \
+                   "days int(3), " \
+                   "student_days int(6), " \
+                   "present_days int(6), " \
+                   "PRIMARY KEY (period, period_start)" \
+                   ")"
+    data_cursor.execute(create_query)
+
+
+def create_student_period_report_table(suffix: str = ""):
+    """
+    Creates table to store individual student attendance report for every week, month and term.
+
+    :param suffix: Added to the name of the table, to create the table written by a migration.
+    """
+    create_query = f"CREATE TABLE paper_reports_database.paper_student_period_report_table{suffix} (" \
+                   "period varchar(5), " \
+                   "period_start date, " \
+                   "student_id int, " \
+                   "total_days int(3), " \
+                   "days_present int(3), " \
+                   "PRIMARY KEY (period, period_start, student_id)" \
+                   ")"
+    data_cursor.execute(create_query)
+
+
+# Set once prepare_record_tables() has checked the schema, and cleared by forget_record_tables()
+# whenever the databases holding the records are dropped or replaced.
+record_tables_ready = False
+
+
+def prepare_record_tables():
+    """
+    Creates the databases and tables which hold the attendance records and the reports, if they do not exist.
+    The schema is checked only on the first call after startup. Later calls cost nothing.
+    """
+    global record_tables_ready
+
+    if record_tables_ready:
+        return
+
+    if not data_storage.has_database("paper_attendance_database"):
+        create_attendance_database()
+
+    attendance_tables = data_storage.get_table_list("paper_attendance_database")
+
+    if "paper_attendance_table" not in attendance_tables:
+        create_attendance_table()
+
+    if "paper_export_manifest_table" not in attendance_tables:
+        create_export_manifest_table()
+
+    if not data_storage.has_database("paper_reports_database"):
+        create_reports_database()
+
+    report_tables = data_storage.get_table_list("paper_reports_database")
+
+    if "paper_student_report_table" not in report_tables:
+        create_student_report_table()
+
+    if "paper_daily_report_table" not in report_tables:
+        create_daily_report_table()
+
+    if "paper_period_report_table" not in report_tables:
+        create_period_report_table()
+
+    if "paper_student_period_report_table" not in report_tables:
+        create_student_period_report_table()
+
+    record_tables_ready = True
+
+
+def forget_record_tables():
+    """Makes the next call of prepare_record_tables() check the schema again."""
+    global record_tables_ready
+    record_tables_ready = False
+
+
+def load_data():
+    """Reads the PIN and the Class Name into the configuration cache."""
+    get_data_query = "SELECT pin, class_name FROM paper_information_database.paper_data_table"
+    data_cursor.execute(get_data_query)
+    data = data_cursor.fetchone()
+
+    # If no row is found, it means that the PIN is not created yet.
+    if data is None:
+        data = (None, None)
+
+    configuration_cache["pin"], configuration_cache["class name"] = data
+
+
+def set_class_name(class_name: str):
+    """Updates the Class Name when it is renamed."""
+    set_class_name_query = "UPDATE paper_information_database.paper_data_table SET class_name = %s"
+    data_cursor.execute(set_class_name_query, (class_name,))
+
+    configuration_cache["class name"] = class_name
+
+
+def get_class_name() -> str or None:
+    """
+    Gets the name of the Class.
+
+    :return: Class name.
+    """
+    if "class name" not in configuration_cache:
+        load_data()
+
+    return configuration_cache["class name"]
+
+
+def get_date() -> tuple[str, list[int]]:
+    """
+    Makes the current date available in 'DD_MM_YYYY' and [DD, MM, YYYY] format.
+
+    :return: A tuple containing today's date in string and list format.
+    """
+    raw_date = strftime("%d-%m-%Y")
+    raw_date = raw_date.split("-")
+    # raw_date is used to set date on date_edit UI elements
+    raw_date = [int(raw_date[i]) for i in range(len(raw_date))]
+
+    date = "_".join(str(i) for i in raw_date)
+
+    return date, raw_date
+
+
+def get_report_date(date: str) -> str:
+    """
+    Converts a date in 'D_M_YYYY' format, in which the attendance records are kept, to 'YYYY-MM-DD' format,
+    in which the daily reports are kept.
+
+    :param date: The date in 'D_M_YYYY' format.
+    :return: The date in 'YYYY-MM-DD' format.
+    """
+    day, month, year = date.split("_")
+    return str(datetime.date(int(year), int(month), int(day)))
+
+
+def get_period_start(period: str, date: datetime.date) -> datetime.date:
+    """
+    Finds the first day of the week, month or term which the provided date falls in.
+
+    :param period: One of REPORT_PERIODS.
+    :param date: The date.
+    :return: The first day of the period.
+    """
+    if period == "week":
+        return date - datetime.timedelta(days=date.weekday())
+
+    if period == "month":
+        return date.replace(day=1)
+
+    # The term which started last in the year of the date, or else the last term of the previous year.
+    start_months = [month for month in TERM_START_MONTHS if month <= date.month]
+    if start_months:
+        return datetime.date(date.year, start_months[-1], 1)
+
+    return datetime.date(date.year - 1, TERM_START_MONTHS[-1], 1)
+
+
+def get_period_end(period: str, period_start: datetime.date) -> datetime.date:
+    """
+    Finds the last day of a week, month or term.
 
-from csv import writer
-from sys import exit
-from time import strftime
+    :param period: One of REPORT_PERIODS.
+    :param period_start: The first day of the period.
+    :return: The last day of the period.
+    """
+    if period == "week":
+        return period_start + datetime.timedelta(days=6)
+
+    # The period ends on the day before the next one starts.
+    if period == "month":
+        next_period_start = (period_start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    else:
+        later_start_months = [month for month in TERM_START_MONTHS if month > period_start.month]
+        if later_start_months:
+            next_period_start = datetime.date(period_start.year, later_start_months[0], 1)
+        else:
+            next_period_start = datetime.date(period_start.year + 1, TERM_START_MONTHS[0], 1)
+
+    return next_period_start - datetime.timedelta(days=1)
+
+
+def get_date_after(days: int) -> str:
+    """
+    Makes the date which comes the provided number of days after today available in 'YYYY-MM-DD' format.
+
+    :param days: Number of days after today.
+    :return: The date in string format.
+    """
+    return str(datetime.date.today() + datetime.timedelta(days=days))
+
+
+def create_pin(pin: str):
+    """
+    Stores the PIN created on the first run of the application.
+
+    :param pin: The new PIN.
+    """
+    create_pin_query = "INSERT INTO paper_information_database.paper_data_table(pin) VALUES (%s)"
+    data_cursor.execute(create_pin_query, (pin,))
+
+    configuration_cache["pin"] = pin
+    configuration_cache["class name"] = None
+
+
+def set_pin(pin: str):
+    """
+    Replaces the current PIN.
+
+    :param pin: The new PIN.
+    """
+    set_pin_query = "UPDATE paper_information_database.paper_data_table SET pin = %s"
+    data_cursor.execute(set_pin_query, (pin,))
+
+    configuration_cache["pin"] = pin
+
+
+def get_pin() -> str or None:
+    """
+    Gets the current pin if it is available.
+
+    :return: The current pin, if available, else None.
+    """
+    if "pin" not in configuration_cache:
+        load_data()
+
+    return configuration_cache["pin"]
+
+
+def load_settings():
+    """Reads the settings into the configuration cache."""
+    get_settings_query = "SELECT * FROM paper_information_database.paper_settings_table"
+
+    # Try to get settings.
+    try:
+        data_cursor.execute(get_settings_query)
+
+    # If an error occurs, it means that the table does not exist.
+    # So create the settings table, which also fills the cache with the default settings.
+    except ProgrammingError:
+        create_settings_table()
+        return
+
+    settings = data_cursor.fetchone()
+    configuration_cache["settings"] = dict(zip(SETTING_COLUMNS, settings))
+
+
+def save_setting(setting: str, value):
+    """
+    Updates the value of a setting.
+
+    :param setting: Name of the setting, one of the keys of the dictionary returned by get_settings().
+    :param value: New value of the setting.
+    """
+    save_setting_query = "UPDATE paper_information_database.paper_settings_table " \
+                         f"SET {SETTING_COLUMNS[setting]} = %s"
+    data_cursor.execute(save_setting_query, (value,))
+
+    if "settings" in configuration_cache:
+        configuration_cache["settings"][setting] = value
+
+
+def restore_default_settings():
+    """Sets all the settings to their default values."""
+    drop_settings_table_query = "DROP TABLE paper_information_database.paper_settings_table"
+    data_cursor.execute(drop_settings_table_query)
+    configuration_cache.pop("settings", None)
+
+    create_settings_table()
+
+
+def get_settings() -> dict:
+    """
+    Prepares list of current values for the application settings.
+
+    :return: Dictionary containing settings and their corresponding values.
+    """
+    if "settings" not in configuration_cache:
+        load_settings()
+
+    # Hand out a copy, so that the cached settings only change when they are saved.
+    return dict(configuration_cache["settings"])
+
+
+class StudentRoster:
+    """
+    The students of the Class, sorted by name, kept in memory along with the roll number and the "id" of every student.
+    The roll number of a student is their position in the sorted list, starting from 1.
+    The roster is read from the database on first use and is then changed in place by add(), remove() and rename(),
+    which must be called after the corresponding change is made to "paper_student_list_table".
+    """
+    def __init__(self):
+        self._names = None
+        self._roll_numbers = None
+        self._student_ids = None
+
+    def _load(self):
+        """Reads the list of students from the database if it is not read yet."""
+        if self._names is not None:
+            return
+
+        # Try to get the list of students.
+        # The students are sorted here rather than by the database, as add() and rename() keep the order
+        # with Python's comparison of strings, which the collation of the database may not agree with.
+        try:
+            get_student_list_query = "SELECT name, id FROM paper_information_database.paper_student_list_table " \
+                                     "WHERE enrolled = 1"
+            data_cursor.execute(get_student_list_query)
+
+            students = sorted(data_cursor.fetchall())
+
+        # If an error occurs, it means that the table is not created till now.
+        # So start with an empty roster.
+        except ProgrammingError:
+            students = list()
+
+        self._names = [name for name, student_id in students]
+        self._student_ids = {name: student_id for name, student_id in students}
+
+        self._index_from(0)
+
+    def _index_from(self, position: int):
+        """
+        Updates the roll numbers of the students starting from the provided position in the list.
+
+        :param position: Position of the first student whose roll number may have changed.
+        """
+        if position == 0:
+            self._roll_numbers = dict()
+
+        for i in range(position, len(self._names)):
+            self._roll_numbers[self._names[i]] = i + 1
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._names)
+
+    def get_names(self) -> list:
+        """
+        Gets the names of all the students in the order of their roll numbers.
+
+        :return: List of students.
+        """
+        self._load()
+        return list(self._names)
+
+    def get_name(self, roll_number: int) -> str or None:
+        """
+        Finds the student having the provided roll number.
+
+        :param roll_number: Roll number of the student.
+        :return: Name of the student, if the roll number exists, else None.
+        """
+        self._load()
+
+        if 0 < roll_number <= len(self._names):
+            return self._names[roll_number - 1]
+
+        return None
+
+    def get_roll_number(self, name: str) -> int or None:
+        """
+        Finds the roll number of the provided student.
+
+        :param name: Name of the student.
+        :return: Roll number of the student, if the student exists, else None.
+        """
+        self._load()
+        return self._roll_numbers.get(name)
+
+    def get_student_id(self, name: str) -> int or None:
+        """
+        Finds the "id" of the provided student.
+
+        :param name: Name of the student.
+        :return: The "id" of the student, if the student exists, else None.
+        """
+        self._load()
+        return self._student_ids.get(name)
+
+    def add(self, name: str, student_id: int):
+        """
+        Adds a student to the roster.
+
+        :param name: Name of the new student.
+        :param student_id: The "id" of the new student.
+        """
+        self._load()
+
+        position = bisect_left(self._names, name)
+        self._names.insert(position, name)
+        self._index_from(position)
+        self._student_ids[name] = student_id
+
+    def remove(self, name: str):
+        """
+        Removes a student from the roster.
+
+        :param name: Name of the student.
+        """
+        self._load()
+
+        position = self._roll_numbers.pop(name) - 1
+        del self._names[position]
+        self._index_from(position)
+        del self._student_ids[name]
+
+    def rename(self, old_name: str, new_name: str):
+        """
+        Renames a student in the roster.
+
+        :param old_name: Current name of the student.
+        :param new_name: New name of the student.
+        """
+        self._load()
+
+        old_position = self._roll_numbers.pop(old_name) - 1
+        del self._names[old_position]
+
+        new_position = bisect_left(self._names, new_name)
+        self._names.insert(new_position, new_name)
+        self._index_from(min(old_position, new_position))
+        self._student_ids[new_name] = self._student_ids.pop(old_name)
+
+    def clear(self):
+        """Forgets the roster, so that it is read again from the database when needed."""
+        self._names = None
+        self._roll_numbers = None
+        self._student_ids = None
+
+
+student_roster = StudentRoster()
+
+
+class StudentSearchIndex:
+    """
+    Finds students by a part of their name, or by their roll number, without looking at every student.
+    Every piece of up to PIECE_LENGTH letters of every name, in lowercase, is indexed with the names containing it.
+    A longer search is looked up by its pieces of PIECE_LENGTH letters, and only the names having all of them
+    are checked. The index is built on the first search after the names change.
+    """
+
+    PIECE_LENGTH = 3
+
+    def __init__(self):
+        self._names = list()
+        self._pieces = None
+
+    def set_names(self, names: list):
+        """
+        Changes the names to search.
+
+        :param names: Names of the students, in the order of their roll numbers.
+        """
+        self._names = list(names)
+        self._pieces = None
+
+    def _build(self):
+        """Indexes the names by the pieces of their lowercase names."""
+        self._pieces = dict()
+
+        for name in self._names:
+            lowercase_name = name.lower()
+
+            for length in range(1, self.PIECE_LENGTH + 1):
+                for i in range(len(lowercase_name) - length + 1):
+                    self._pieces.setdefault(lowercase_name[i:i + length], set()).add(name)
+
+    def find(self, search_text: str) -> set or None:
+        """
+        Finds the students whose name contains the search text, or whose roll number is the search text.
+
+        :param search_text: Text typed by the user.
+        :return: Names of the students found, or None if the search text is empty, which matches every student.
+        """
+        search_text = search_text.lower().strip()
+        if search_text == "":
+            return None
+
+        if self._pieces is None:
+            self._build()
+
+        if len(search_text) <= self.PIECE_LENGTH:
+            found = set(self._pieces.get(search_text, ()))
+        else:
+            candidates = [self._pieces.get(search_text[i:i + self.PIECE_LENGTH], set())
+                          for i in range(len(search_text) - self.PIECE_LENGTH + 1)]
+            found = {name for name in min(candidates, key=len) if search_text in name.lower()}
+
+        if search_text.isdigit() and 0 < int(search_text) <= len(self._names):
+            found.add(self._names[int(search_text) - 1])
+
+        return found
+
+
+def get_student_list(date: str = None) -> list:
+    """
+    Prepares list of students studying in the Class on the provided date.
+
+    :param date: Date for preparing student list.
+    :return: List of students.
+    """
+    student_list = list()
+
+    # date = None means: get student list for today's date, which is the current roster.
+    if date is None:
+        return student_roster.get_names()
+
+    # Try to get student list from past attendance records.
+    try:
+        get_student_list_from_records_query = "SELECT student.name, student.id " \
+                                              "FROM paper_attendance_database.paper_attendance_table AS record " \
+                                              "JOIN paper_information_database.paper_student_list_table AS student " \
+                                              "ON student.id = record.student_id " \
+                                              "WHERE record.date = %s"
+        data_cursor.execute(get_student_list_from_records_query, (date,))
+
+        # Sort the students in the same order as the roster. Students of the same name are kept in the order
+        # of their "id".
+        data = sorted(data_cursor.fetchall())
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    # So return the empty student list.
+    except ProgrammingError:
+        return student_list
+
+    # If no error occurred, prepare student list from the data received from the database.
+    for student in data:
+        student_list.append(student[0])
+
+    return student_list
+
+
+def is_attendance_recorded(date: str, cursor: DataCursor = data_cursor) -> bool:
+    """
+    Tells whether the attendance has been recorded for the provided date.
+
+    :param date: Date to look for in the attendance records.
+    :param cursor: Cursor to run the query on.
+    :return: True if the attendance record for the date exists, else False.
+    """
+    # Try to find any attendance data for the provided date.
+    try:
+        test_for_record_query = "SELECT count(*) FROM paper_attendance_database.paper_attendance_table " \
+                                "WHERE date = %s"
+        cursor.execute(test_for_record_query, (date,))
+
+        return cursor.fetchone()[0] > 0
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return False
+
+
+def get_record_states(date: str) -> list:
+    """
+    Gets the attendance state of every student in the attendance record of the provided date.
+    The students are found by their roll number in the record, as a student removed from the Class
+    may have had the same name as a student who joined later.
+
+    :param date: Date of the attendance record.
+    :return: List of (name, "id", state) of every student in the order of their roll numbers,
+             which is empty if the attendance has not been recorded for the date.
+    """
+    # Try to get the attendance record of the date.
+    try:
+        get_record_query = "SELECT student.name, record.student_id, record.state " \
+                           "FROM paper_attendance_database.paper_attendance_table AS record " \
+                           "JOIN paper_information_database.paper_student_list_table AS student " \
+                           "ON student.id = record.student_id " \
+                           "WHERE record.date = %s"
+        data_cursor.execute(get_record_query, (date,))
+
+        # Sort the students in the same order as the roster.
+        return sorted(data_cursor.fetchall())
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return list()
+
+
+def get_attendance_record(date: str, cursor: DataCursor = data_cursor) -> tuple[list, list]:
+    """
+    Prepares the lists of students present and absent on the provided date, along with their roll numbers.
+    The roll numbers are the positions of the students in the name-sorted list of that date,
+    so both the lists are made from a single query in one pass.
+
+    :param date: Date of the attendance record.
+    :param cursor: Cursor to run the query on.
+    :return: Lists of (name, roll number) of present and of absent students.
+    """
+    present = list()
+    absent = list()
+
+    get_attendance_record_query = "SELECT student.name, student.id, record.state " \
+                                  "FROM paper_attendance_database.paper_attendance_table AS record " \
+                                  "JOIN paper_information_database.paper_student_list_table AS student " \
+                                  "ON student.id = record.student_id " \
+                                  "WHERE record.date = %s"
+    cursor.execute(get_attendance_record_query, (date,))
+
+    # Sort the students in the same order as the roster, so that the roll numbers match.
+    for roll_number, (name, student_id, state) in enumerate(sorted(cursor.fetchall()), start=1):
+        if state == "P":
+            present.append((name, roll_number))
+        else:
+            absent.append((name, roll_number))
+
+    return present, absent
+
+
+def get_daily_report(date: str, cursor: DataCursor = data_cursor) -> tuple:
+    """
+    Gets the daily report of the provided date.
+
+    :param date: Date of the report.
+    :param cursor: Cursor to run the query on.
+    :return: (present, absent, attendance percentage), or None if there is no report for the date.
+    """
+    # Try to get the report for the date.
+    try:
+        get_report_query = "SELECT present, absent, attendance_percentage " \
+                           "FROM paper_reports_database.paper_daily_report_table " \
+                           "WHERE date = %s"
+        cursor.execute(get_report_query, (get_report_date(date),))
+
+        return cursor.fetchone()
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return None
+
+
+def get_student_report(cursor: DataCursor = data_cursor) -> list:
+    """
+    Gets the attendance report of every student of the class.
+    The reports of the students removed from the class are kept, but not shown.
+
+    :param cursor: Cursor to run the query on.
+    :return: List of (name, total days, days present) of every student, in the order of their names.
+    """
+    # Try to get the report of every student.
+    try:
+        get_student_report_query = "SELECT student.name, report.total_days, report.days_present " \
+                                   "FROM paper_reports_database.paper_student_report_table AS report " \
+                                   "JOIN paper_information_database.paper_student_list_table AS student " \
+                                   "ON student.id = report.student_id " \
+                                   "WHERE student.enrolled = 1"
+        cursor.execute(get_student_report_query)
+
+        # Sort the students in the same order as the roster.
+        return sorted(cursor.fetchall())
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return list()
+
+
+def get_report_date_range(cursor: DataCursor = data_cursor) -> tuple:
+    """
+    Finds the first and the last dates having a daily report.
+
+    :param cursor: Cursor to run the query on.
+    :return: The first and the last dates in 'YYYY-MM-DD' format, or (None, None) if there are no reports.
+    """
+    # Try to get the first and the last dates, which are the ends of the primary key.
+    try:
+        get_date_range_query = "SELECT min(date), max(date) FROM paper_reports_database.paper_daily_report_table"
+        cursor.execute(get_date_range_query)
+        first_date, last_date = cursor.fetchone()
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return None, None
+
+    if first_date is None:
+        return None, None
+
+    return str(first_date), str(last_date)
+
+
+def get_attendance_percentage_series(start_date: str, end_date: str, cursor: DataCursor = data_cursor) -> list:
+    """
+    Gets the attendance percentage of the class on every day between two dates, both included,
+    through a range scan of the primary key.
+
+    :param start_date: The first date in 'YYYY-MM-DD' format.
+    :param end_date: The last date in 'YYYY-MM-DD' format.
+    :param cursor: Cursor to run the query on.
+    :return: List of (date in 'YYYY-MM-DD' format, attendance percentage) of every day, oldest first.
+    """
+    # Try to get attendance percentage data.
+    try:
+        get_series_query = "SELECT date, attendance_percentage FROM paper_reports_database.paper_daily_report_table " \
+                           "WHERE date BETWEEN %s AND %s ORDER BY date"
+        cursor.execute(get_series_query, (start_date, end_date))
+
+        return [(str(date), float(attendance_percentage)) for date, attendance_percentage in cursor.fetchall()]
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return list()
+
+
+def get_period_report(period: str, period_start: str, cursor: DataCursor = data_cursor) -> tuple:
+    """
+    Gets the attendance report of the class for a week, month or term.
+
+    :param period: One of REPORT_PERIODS.
+    :param period_start: The first day of the period, in 'YYYY-MM-DD' format.
+    :param cursor: Cursor to run the query on.
+    :return: (days recorded, total of the students on every day, total of the students present on every day),
+             or None if there is no report for the period.
+    """
+    # Try to get the report for the period.
+    try:
+        get_report_query = "SELECT days, student_days, present_days " \
+                           "FROM paper_reports_database.paper_period_report_table " \
+                           "WHERE period = %s AND period_start = %s"
+        cursor.execute(get_report_query, (period, period_start))
+
+        return cursor.fetchone()
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return None
+
+
+def get_student_period_report(period: str, period_start: str, cursor: DataCursor = data_cursor) -> list:
+    """
+    Gets the attendance report of every student of the class for a week, month or term.
+    The reports of the students removed from the class are kept, but not shown.
+
+    :param period: One of REPORT_PERIODS.
+    :param period_start: The first day of the period, in 'YYYY-MM-DD' format.
+    :param cursor: Cursor to run the query on.
+    :return: List of (name, total days, days present) of every student, in the order of their names.
+    """
+    # Try to get the report of every student.
+    try:
+        get_student_report_query = "SELECT student.name, report.total_days, report.days_present " \
+                                   "FROM paper_reports_database.paper_student_period_report_table AS report " \
+                                   "JOIN paper_information_database.paper_student_list_table AS student " \
+                                   "ON student.id = report.student_id " \
+                                   "WHERE student.enrolled = 1 " \
+                                   "AND report.period = %s AND report.period_start = %s"
+        cursor.execute(get_student_report_query, (period, period_start))
+
+        # Sort the students in the same order as the roster.
+        return sorted(cursor.fetchall())
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return list()
+
+
+def count_student_attendance(cursor: DataCursor = data_cursor) -> list:
+    """
+    Counts the total days and the days present of every student from the attendance records,
+    in a single grouped pass over all the records.
+
+    :param cursor: Cursor to run the query on.
+    :return: List of (student id, total days, days present) of every student.
+    """
+    # Try to count the attendance of every student.
+    try:
+        count_attendance_query = "SELECT student_id, count(*), SUM(state = %s) " \
+                                 "FROM paper_attendance_database.paper_attendance_table " \
+                                 "GROUP BY student_id"
+        cursor.execute(count_attendance_query, ("P",))
+
+        return [(student_id, total_days, int(days_present))
+                for student_id, total_days, days_present in cursor.fetchall()]
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        return list()
+
+
+def check_student_report(cursor: DataCursor = data_cursor) -> list:
+    """
+    Compares the attendance report of every student, as kept, with the attendance counted from the records.
+    The students removed from the class are compared too, as their reports are kept.
+
+    :param cursor: Cursor to run the queries on.
+    :return: List of (student id, (total days, days present) as kept, (total days, days present) as counted)
+             of every student whose report differs. A report which is missing is None.
+    """
+    # Try to get the report of every student, as kept.
+    try:
+        get_student_report_query = "SELECT student_id, total_days, days_present " \
+                                   "FROM paper_reports_database.paper_student_report_table"
+        cursor.execute(get_student_report_query)
+
+        kept_report = {
+            student_id: (total_days, days_present) for student_id, total_days, days_present in cursor.fetchall()
+        }
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    except ProgrammingError:
+        kept_report = dict()
+
+    counted_report = {
+        student_id: (total_days, days_present)
+        for student_id, total_days, days_present in count_student_attendance(cursor)
+    }
+
+    differences = list()
+    for student_id in sorted(kept_report.keys() | counted_report.keys()):
+        if kept_report.get(student_id) != counted_report.get(student_id):
+            differences.append((student_id, kept_report.get(student_id), counted_report.get(student_id)))
+
+    return differences
 
-try:
-    import mysql.connector as server
-    from PyQt6 import QtWidgets, QtCore, uic, QtGui
-    from pyqtgraph import *
 
-except ImportError:
-    from tkinter import Tk, messagebox
+def get_student_names(student_ids: list, cursor: DataCursor = data_cursor) -> list:
+    """
+    Finds the names of the provided students, including the students removed from the class.
 
-    root = Tk()
-    root.attributes("-topmost", True)
-    root.overrideredirect(True)
-    root.withdraw()
+    :param student_ids: List of "id" of the students.
+    :param cursor: Cursor to run the query on.
+    :return: List of names, in the order of the provided students.
+    """
+    cursor.execute("SELECT id, name FROM paper_information_database.paper_student_list_table")
+    names = dict(cursor.fetchall())
 
-    messagebox.showerror(title="Paper - Cannot run app",
-                         message="One or all of the following modules required to run the app were not found:\n\n"
-                                 "PyQt6\n"
-                                 "pyqtgraph\n"
-                                 "mysql.connector\n\n"
-                                 "If Python is added to Path, type: pip install <module> in your terminal " \
-                                 "to install the modules.")
-    exit()
+    # Records may be left of a student who is no longer in the list of students.
+    return [names.get(student_id, f"Student {student_id}") for student_id in student_ids]
 
-data_server = server.connect(
-    host="localhost",
-    user="root",
-    password="password"
-)
-data_server.autocommit = True
-data_cursor = data_server.cursor(buffered=True)
 
+def rebuild_student_report():
+    """
+    Replaces the attendance report of every student with the attendance counted from the records,
+    in a single grouped pass over all the records.
+    """
+    prepare_record_tables()
+
+    rebuild_report_query = "INSERT INTO paper_reports_database.paper_student_report_table " \
+                           "(student_id, total_days, days_present) " \
+                           "SELECT student_id, count(*), SUM(state = %s) " \
+                           "FROM paper_attendance_database.paper_attendance_table " \
+                           "GROUP BY student_id"
+    data_storage.start_transaction()
+    try:
+        data_cursor.execute("DELETE FROM paper_reports_database.paper_student_report_table")
+        data_cursor.execute(rebuild_report_query, ("P",))
 
-def create_information_database():
-    """Creates database to store all the information used by the app."""
-    create_query = "CREATE DATABASE paper_information_database"
-    data_cursor.execute(create_query)
+    # If an error occurs, keep the report as it was and let the error propagate.
+    except DatabaseError:
+        data_storage.rollback()
+        raise
 
-    use_information_database()
+    data_storage.commit()
 
 
-def use_information_database():
-    """Sets the working database to paper_information_database."""
-    use_query = "USE paper_information_database"
-    data_cursor.execute(use_query)
+def repair_student_report() -> int:
+    """
+    Checks the attendance report of every student against the attendance records,
+    and rebuilds the report if any of them differs.
 
+    :return: Number of students whose report differed.
+    """
+    differences = check_student_report()
 
-def create_attendance_database():
-    """Creates database to store all the attendance records."""
-    create_query = "CREATE DATABASE paper_attendance_database"
-    data_cursor.execute(create_query)
+    if differences:
+        rebuild_student_report()
 
-    use_attendance_database()
+    return len(differences)
 
 
-def use_attendance_database():
-    """Sets the working database to paper_attendance_database."""
-    use_query = "USE paper_attendance_database"
-    data_cursor.execute(use_query)
+# Added to the names of the tables written by a migration, which replace the old tables once they are complete.
+NEW_TABLE_SUFFIX = "_new"
 
 
-def create_reports_database():
-    """Creates database to store all the attendance reports."""
-    create_query = "CREATE DATABASE paper_reports_database"
-    data_cursor.execute(create_query)
+def swap_in_new_tables(tables: list):
+    """
+    Replaces tables by the complete tables written next to them by a migration.
 
-    use_reports_database()
+    :param tables: List of (database, table) of the tables to replace.
+    """
+    for database, table in tables:
+        if table in data_storage.get_table_list(database):
+            data_cursor.execute(f"DROP TABLE {database}.{table}")
 
+        data_storage.rename_table(database, table + NEW_TABLE_SUFFIX, table)
 
-def use_reports_database():
-    """Sets the working database to paper_reports_database."""
-    use_query = "USE paper_reports_database"
-    data_cursor.execute(use_query)
 
+def finish_table_swaps(tables: list):
+    """
+    Finishes the work of a migration which was stopped, like by closing the app, after writing new tables.
+    The old tables are dropped only once all the new tables are complete. So if an old table is missing,
+    the rest of the new tables are swapped in. Else the new tables are dropped, and the migration runs again.
 
-def create_data_table():
-    """Creates table to store the PIN and Class Name provided by the user."""
-    use_information_database()
+    :param tables: List of (database, table) of the tables replaced by the migration.
+    """
+    new_tables = [
+        (database, table) for database, table in tables
+        if data_storage.has_database(database) and table + NEW_TABLE_SUFFIX in data_storage.get_table_list(database)
+    ]
 
-    create_query = "CREATE TABLE paper_data_table (" \
-                   "pin varchar(4), " \
-                   "class_name varchar(20)" \
-                   ")"
-    data_cursor.execute(create_query)
+    if any(table not in data_storage.get_table_list(database) for database, table in new_tables):
+        swap_in_new_tables(new_tables)
+    else:
+        for database, table in new_tables:
+            data_cursor.execute(f"DROP TABLE {database}.{table}{NEW_TABLE_SUFFIX}")
 
 
-def create_student_list_table():
-    """Creates table to store the name of all the students of a class."""
-    use_information_database()
+def migrate_attendance_records() -> bool:
+    """
+    Moves attendance records kept by older versions of the app, one table per day named
+    'DD_MM_YYYY', into "paper_attendance_table" and drops the old tables.
 
-    create_table_query = "CREATE TABLE paper_student_list_table (" \
-                         "name varchar(40) PRIMARY KEY" \
-                         ")"
-    data_cursor.execute(create_table_query)
+    :return: True if any attendance record was moved, else False.
+    """
+    # Every table other than "paper_attendance_table" and "paper_export_manifest_table" is an old
+    # day-wise attendance record.
+    old_records = [
+        record for record in data_storage.get_table_list("paper_attendance_database")
+        if record not in ("paper_attendance_table", "paper_export_manifest_table")
+    ]
+
+    for record in old_records:
+        # Every old table is moved in a transaction of its own. MySQL commits the rows before dropping
+        # the table, so if the app stops in between, the next start finds the date moved already
+        # and only drops the table.
+        data_storage.start_transaction()
+        try:
+            move_attendance_record(record)
 
+        # If an error occurs, undo the rows moved so far and let the error propagate.
+        except DatabaseError:
+            data_storage.rollback()
+            raise
 
-def create_settings_table():
-    """Creates table to store all the setting values."""
-    use_information_database()
+        data_storage.commit()
 
-    create_query = "CREATE TABLE paper_settings_table (" \
-                   "check_present varchar(1), " \
-                   "minimum_attendance int(3), " \
-                   "backup_frequency int(1), " \
-                   "backup_date date" \
-                   ")"
-    data_cursor.execute(create_query)
+    return len(old_records) > 0
 
-    set_default_settings_query = "INSERT INTO paper_settings_table " \
-                                 "VALUES ('N', 75, 2, date_add(curdate(), interval 30 day))"
-    data_cursor.execute(set_default_settings_query)
 
+def move_attendance_record(record: str):
+    """
+    Helper function for migrate_attendance_records(), which moves a single old day-wise attendance record
+    into "paper_attendance_table" and drops its table. A date which is moved already is not moved again.
 
-def create_attendance_table(date: str):
+    :param record: Name of the old table, which is the date of the record.
+    """
+    is_moved_query = "SELECT count(*) FROM paper_attendance_database.paper_attendance_table WHERE date = %s"
+    data_cursor.execute(is_moved_query, (record,))
+
+    if data_cursor.fetchone()[0] == 0:
+        # The old records refer to the students by name. The students removed from the class since
+        # are added to the list of students first, as students who are not enrolled.
+        add_removed_students_query = "INSERT INTO paper_information_database.paper_student_list_table " \
+                                     "(name, enrolled) " \
+                                     f"SELECT DISTINCT name, 0 FROM paper_attendance_database.`{record}` " \
+                                     "WHERE name NOT IN (" \
+                                     "SELECT name FROM paper_information_database.paper_student_list_table" \
+                                     ")"
+        data_cursor.execute(add_removed_students_query)
+
+        move_record_query = "INSERT INTO paper_attendance_database.paper_attendance_table " \
+                            "(date, student_id, state) " \
+                            "SELECT %s, student.id, record.state " \
+                            f"FROM paper_attendance_database.`{record}` AS record " \
+                            "JOIN paper_information_database.paper_student_list_table AS student " \
+                            "ON student.name = record.name"
+        data_cursor.execute(move_record_query, (record,))
+
+    drop_record_query = f"DROP TABLE paper_attendance_database.`{record}`"
+    data_cursor.execute(drop_record_query)
+
+
+def migrate_student_ids() -> bool:
     """
-    Creates table to store the daily attendance record.
+    Gives an "id" to the students kept by older versions of the app, which referred to the students by name
+    in the list of students, the attendance records and the reports, and makes the records and the reports
+    refer to the students by "id".
 
-    :param date: Date for creating attendance table.
+    :return: True if the students were given an "id", else False.
     """
-    use_attendance_database()
+    # Try to find the "id" of the students. If no error occurs, the students have an "id" already. Do nothing.
+    try:
+        data_cursor.execute("SELECT count(id) FROM paper_information_database.paper_student_list_table")
+        return False
 
-    create_query = f"CREATE TABLE {date} (" \
-                   "name varchar(40) PRIMARY KEY, " \
-                   "state varchar(1)" \
-                   ")"
-    data_cursor.execute(create_query)
+    except ProgrammingError:
+        pass
 
+    # The tables rewritten by the migration. The list of students is swapped in last, so once it has an "id",
+    # all the tables have been swapped in.
+    migrated_tables = [
+        ("paper_attendance_database", "paper_attendance_table"),
+        ("paper_reports_database", "paper_student_report_table"),
+        ("paper_reports_database", "paper_student_period_report_table"),
+        ("paper_information_database", "paper_student_list_table")
+    ]
+    finish_table_swaps(migrated_tables)
+
+    # Try to find the "id" of the students again. If no error occurs, a migration which was stopped
+    # has just been finished.
+    try:
+        data_cursor.execute("SELECT count(id) FROM paper_information_database.paper_student_list_table")
+        return True
 
-def create_student_report_table():
-    """Creates table to store individual student attendance report."""
-    use_reports_database()
+    except ProgrammingError:
+        pass
 
-    create_query = "CREATE TABLE paper_student_report_table (" \
-                   "name varchar(40) PRIMARY KEY, " \
-                   "total_days int(3), " \
-                   "days_present int(3)" \
-                   ")"
-    data_cursor.execute(create_query)
+    # Try to read the list of students. If an error occurs, it means that no class is created. Do nothing.
+    try:
+        data_cursor.execute("SELECT name FROM paper_information_database.paper_student_list_table ORDER BY name")
+        enrolled_names = [student[0] for student in data_cursor.fetchall()]
+
+    except ProgrammingError:
+        return False
+
+    # Read the rows of every table which refers to the students by name, if the table exists.
+    # The name is the second column of every row read.
+    old_tables = [
+        ("paper_attendance_database", "paper_attendance_table", ["date", "name", "state"],
+         create_attendance_table),
+        ("paper_reports_database", "paper_student_report_table", ["total_days", "name", "days_present"],
+         create_student_report_table),
+        ("paper_reports_database", "paper_student_period_report_table",
+         ["period", "name", "period_start", "total_days", "days_present"], create_student_period_report_table)
+    ]
+    old_rows = dict()
+    for database, table, columns, create_table in old_tables:
+        try:
+            data_cursor.execute(f"SELECT {', '.join(columns)} FROM {database}.{table}")
+            old_rows[table] = data_cursor.fetchall()
 
+        except ProgrammingError:
+            pass
 
-def create_daily_report_table():
-    """Creates table to store daily attendance report."""
-    use_reports_database()
+    # The students of the class get an "id" first, then the students removed from the class,
+    # who are only found in the records and the reports.
+    student_ids = {name: student_id for student_id, name in enumerate(enrolled_names, start=1)}
+    removed_names = sorted(set(row[1] for rows in old_rows.values() for row in rows) - student_ids.keys())
+    for name in removed_names:
+        student_ids[name] = len(student_ids) + 1
 
-    create_query = "CREATE TABLE paper_daily_report_table (" \
-                   "id int AUTO_INCREMENT PRIMARY KEY, " \
-                   "date varchar(10) UNIQUE, " \
-                   "present int(3), " \
-                   "absent int(3), " \
-                   "attendance_percentage decimal(4, 1)" \
-                   ")"
-    data_cursor.execute(create_query)
+    # The rows are written to new tables, which replace the old tables once all the rows are written.
+    # Creating a table ends a transaction, so all the tables are created beforehand.
+    create_student_list_table(NEW_TABLE_SUFFIX)
 
+    for database, table, columns, create_table in old_tables:
+        if table in old_rows:
+            create_table(NEW_TABLE_SUFFIX)
 
-def set_class_name(class_name: str):
-    """Updates the Class Name when it is renamed."""
-    use_information_database()
+    add_students_query = f"INSERT INTO paper_information_database.paper_student_list_table{NEW_TABLE_SUFFIX} " \
+                         "(id, name, enrolled) VALUES (%s, %s, %s)"
+    data_storage.start_transaction()
+    try:
+        data_cursor.executemany(
+            add_students_query,
+            [(student_ids[name], name, 1) for name in enrolled_names] +
+            [(student_ids[name], name, 0) for name in removed_names]
+        )
+
+        for database, table, columns, create_table in old_tables:
+            if table in old_rows:
+                new_columns = ["student_id" if column == "name" else column for column in columns]
+                write_rows_query = f"INSERT INTO {database}.{table}{NEW_TABLE_SUFFIX} ({', '.join(new_columns)}) " \
+                                   f"VALUES ({', '.join(['%s'] * len(new_columns))})"
+                data_cursor.executemany(
+                    write_rows_query,
+                    [(row[0], student_ids[row[1]]) + tuple(row[2:]) for row in old_rows[table]]
+                )
 
-    set_class_name_query = f"UPDATE paper_data_table SET class_name = '{class_name}'"
-    data_cursor.execute(set_class_name_query)
+    # If an error occurs, undo the rows written so far and let the error propagate.
+    # The old tables are left as they were.
+    except DatabaseError:
+        data_storage.rollback()
+        raise
 
+    data_storage.commit()
 
-def get_class_name() -> str or None:
-    """
-    Gets the name of the Class.
+    swap_in_new_tables([
+        (database, table) for database, table in migrated_tables
+        if table in old_rows or table == "paper_student_list_table"
+    ])
 
-    :return: Class name.
+    return True
+
+
+def migrate_daily_reports():
     """
-    use_information_database()
+    Moves the daily reports kept by older versions of the app, which were keyed by an "id" in the order
+    they were written and kept their dates in 'D_M_YYYY' format, into the table keyed by date.
+    """
+    finish_table_swaps([("paper_reports_database", "paper_daily_report_table")])
 
+    # Try to read the reports along with their "id". If an error occurs, it means that the reports
+    # are kept by date already. Do nothing.
     try:
-        get_class_name_query = "SELECT class_name FROM paper_data_table"
-        data_cursor.execute(get_class_name_query)
+        get_old_reports_query = "SELECT id, date, present, absent, attendance_percentage " \
+                                "FROM paper_reports_database.paper_daily_report_table"
+        data_cursor.execute(get_old_reports_query)
+        old_reports = data_cursor.fetchall()
 
-        class_name = data_cursor.fetchone()[0]
+    except ProgrammingError:
+        return
 
-        return class_name
-    except TypeError:
-        return None
+    reports = [(get_report_date(date), present, absent, str(attendance_percentage))
+               for report_id, date, present, absent, attendance_percentage in old_reports]
 
+    # The reports are written to a new table, which replaces the old table once all the reports are written.
+    create_daily_report_table(NEW_TABLE_SUFFIX)
 
-def get_date() -> tuple[str, list[int]]:
-    """
-    Makes the current date available in 'DD_MM_YYYY' and [DD, MM, YYYY] format.
+    write_reports_query = f"INSERT INTO paper_reports_database.paper_daily_report_table{NEW_TABLE_SUFFIX} " \
+                          "(date, present, absent, attendance_percentage) VALUES (%s, %s, %s, %s)"
+    data_storage.start_transaction()
+    try:
+        data_cursor.executemany(write_reports_query, reports)
 
-    :return: A tuple containing today's date in string and list format.
+    # If an error occurs, undo the reports written so far and let the error propagate.
+    # The old table is left as it was.
+    except DatabaseError:
+        data_storage.rollback()
+        raise
+
+    data_storage.commit()
+
+    swap_in_new_tables([("paper_reports_database", "paper_daily_report_table")])
+
+
+def migrate_period_reports():
     """
-    raw_date = strftime("%d-%m-%Y")
-    raw_date = raw_date.split("-")
-    # raw_date is used to set date on date_edit UI elements
-    raw_date = [int(raw_date[i]) for i in range(len(raw_date))]
+    Prepares the week, month and term reports from the attendance records kept before the app kept them,
+    or restored from a snapshot which did not have them.
+    """
+    # If there is a period report, or there is no daily report to add up, there is nothing to prepare.
+    data_cursor.execute("SELECT count(*) FROM paper_reports_database.paper_period_report_table")
+    if data_cursor.fetchone()[0] > 0 or get_report_date_range()[0] is None:
+        return
+
+    data_cursor.execute("SELECT date, student_id, state FROM paper_attendance_database.paper_attendance_table")
+
+    # Add up the records of every period in memory, in a single pass over all the records.
+    period_reports = dict()
+    student_period_reports = dict()
+    for date, student_id, state in data_cursor.fetchall():
+        report_date = datetime.date.fromisoformat(get_report_date(date))
+        present = 1 if state == "P" else 0
+
+        for period in REPORT_PERIODS:
+            period_start = str(get_period_start(period, report_date))
+
+            dates, student_days, present_days = period_reports.get((period, period_start), (set(), 0, 0))
+            dates.add(date)
+            period_reports[(period, period_start)] = (dates, student_days + 1, present_days + present)
+
+            total_days, days_present = student_period_reports.get((period, period_start, student_id), (0, 0))
+            student_period_reports[(period, period_start, student_id)] = (total_days + 1, days_present + present)
+
+    write_reports_query = "INSERT INTO paper_reports_database.paper_period_report_table " \
+                          "(period, period_start, days, student_days, present_days) VALUES (%s, %s, %s, %s, %s)"
+    write_student_reports_query = "INSERT INTO paper_reports_database.paper_student_period_report_table " \
+                                  "(period, period_start, student_id, total_days, days_present) " \
+                                  "VALUES (%s, %s, %s, %s, %s)"
+    data_storage.start_transaction()
+    try:
+        data_cursor.executemany(
+            write_reports_query,
+            [key + (len(dates), student_days, present_days)
+             for key, (dates, student_days, present_days) in period_reports.items()]
+        )
+        data_cursor.executemany(
+            write_student_reports_query,
+            [key + report for key, report in student_period_reports.items()]
+        )
 
-    date = "_".join(str(i) for i in raw_date)
+    # If an error occurs, undo the reports written so far and let the error propagate.
+    except DatabaseError:
+        data_storage.rollback()
+        raise
 
-    return date, raw_date
+    data_storage.commit()
 
 
-def get_pin() -> str or None:
+def mark_record_changed(date: str):
     """
-    Gets the current pin if it is available.
+    Notes that the attendance record of the provided date changed, so that the next export writes it again.
 
-    :return: The current pin, if available, else None.
+    :param date: Date of the attendance record.
+    """
+    mark_record_changed_query = "DELETE FROM paper_attendance_database.paper_export_manifest_table " \
+                                "WHERE date = %s"
+    data_cursor.execute(mark_record_changed_query, (date,))
+
+
+def mark_student_records_changed(student_id: int):
     """
-    use_information_database()
+    Notes that the attendance records of every date the provided student was part of changed,
+    so that the next export writes them again with the new name of the student.
 
+    :param student_id: The "id" of the student.
+    """
+    # Try to find the records of the student through the index on the student.
     try:
-        get_pin_query = "SELECT pin FROM paper_data_table"
-        data_cursor.execute(get_pin_query)
+        mark_records_changed_query = "DELETE FROM paper_attendance_database.paper_export_manifest_table " \
+                                     "WHERE date IN (" \
+                                     "SELECT date FROM paper_attendance_database.paper_attendance_table " \
+                                     "WHERE student_id = %s" \
+                                     ")"
+        data_cursor.execute(mark_records_changed_query, (student_id,))
+
+    # If an error occurs, it means that no attendance has been recorded till now.
+    # Do nothing.
+    except ProgrammingError:
+        pass
 
-        pin = data_cursor.fetchone()[0]
-        return pin
-    except TypeError:
-        return None
 
+def export_data(export_format: str = "daily files"):
+    """
+    Exports attendance data to external file on hard-disk.
 
-def get_settings() -> dict:
+    :param export_format: One of EXPORT_FORMATS.
     """
-    Prepares list of current values for the application settings.
+    export_data_dialog = ExportDataDialog(export_format)
+    export_data_dialog.exec()
 
-    :return: Dictionary containing settings and their corresponding values.
+
+# The tables saved in a snapshot, by database, with their columns and the functions which create them.
+# "paper_export_manifest_table" tells which files the last export wrote, which a restore does not bring back.
+# So it is left out, and created empty by prepare_record_tables() after a restore.
+SNAPSHOT_TABLES = {
+    "paper_information_database": [
+        ("paper_data_table", ["pin", "class_name"], create_data_table),
+        ("paper_student_list_table", ["id", "name", "enrolled"], create_student_list_table),
+        ("paper_settings_table", ["check_present", "minimum_attendance", "backup_frequency", "backup_date"],
+         create_settings_table)
+    ],
+    "paper_attendance_database": [
+        ("paper_attendance_table", ["date", "student_id", "state"], create_attendance_table)
+    ],
+    "paper_reports_database": [
+        ("paper_student_report_table", ["student_id", "total_days", "days_present"], create_student_report_table),
+        ("paper_daily_report_table", ["date", "present", "absent", "attendance_percentage"],
+         create_daily_report_table),
+        ("paper_period_report_table", ["period", "period_start", "days", "student_days", "present_days"],
+         create_period_report_table),
+        ("paper_student_period_report_table",
+         ["period", "period_start", "student_id", "total_days", "days_present"], create_student_period_report_table)
+    ]
+}
+
+# The tables which older snapshots hold but which are no longer restored, by database.
+SKIPPED_SNAPSHOT_TABLES = {
+    "paper_attendance_database": ["paper_export_manifest_table"]
+}
+
+
+def is_restored_table(item: dict, databases: list) -> bool:
     """
-    use_information_database()
+    Finds whether the rows of a table saved in a snapshot are restored.
+    The names of the database and the table are written into the statements, so a snapshot naming a table
+    which the app does not save raises ValueError.
 
-    # Try to get settings.
-    try:
-        get_settings_query = "SELECT * FROM paper_settings_table"
-        data_cursor.execute(get_settings_query)
+    :param item: The dictionary starting the rows of the table in the snapshot.
+    :param databases: Databases saved in the snapshot.
+    :return: True if the rows are restored, False if they are skipped.
+    """
+    database, table = item["database"], item["table"]
 
-    # If an error occurs, it means that the table does not exist.
-    # So create the settings table and get settings.
-    except server.ProgrammingError:
-        create_settings_table()
+    if database in databases:
+        if table in [saved_table for saved_table, columns, create_table in SNAPSHOT_TABLES[database]]:
+            return True
 
-        get_settings_query = "SELECT * FROM paper_settings_table"
-        data_cursor.execute(get_settings_query)
+    if table in SKIPPED_SNAPSHOT_TABLES.get(database, list()):
+        return False
 
-    settings = data_cursor.fetchall()
-    current_settings = {
-        "check present": settings[0][0],
-        "minimum attendance": settings[0][1],
-        "backup frequency": settings[0][2],
-        "backup date": settings[0][3]
-    }
-    return current_settings
+    raise ValueError(f"The snapshot holds an unknown table: {database}.{table}")
 
 
-def get_student_list(date: str = None) -> list:
+class SnapshotUpgrade:
+    """
+    Prepares the rows saved in a snapshot by an older version of the app for the tables of this version,
+    while the snapshot is restored.
+    Older versions kept the daily reports by an "id", in the order they were written, with their dates
+    in 'D_M_YYYY' format, and referred to the students by name instead of by "id".
     """
-    Prepares list of students studying in the Class on the provided date.
 
-    :param date: Date for preparing student list.
-    :return: List of students.
+    def __init__(self):
+        # The "id" given to every student named in the snapshot, and the students found in the list of students.
+        self._student_ids = dict()
+        self._listed_names = set()
+
+    def _get_student_id(self, name: str) -> int:
+        """
+        Finds the "id" given to a student named in the snapshot, giving the next "id" to a new name.
+
+        :param name: Name of the student.
+        :return: The "id" of the student.
+        """
+        if name not in self._student_ids:
+            self._student_ids[name] = len(self._student_ids) + 1
+
+        return self._student_ids[name]
+
+    def prepare(self, table: str, columns: list) -> tuple:
+        """
+        Prepares the rows of a table saved in the snapshot.
+
+        :param table: The table.
+        :param columns: Columns saved in the snapshot.
+        :return: The columns to restore, and a function converting a saved row to a row to restore,
+                 or None if the rows need no change.
+        """
+        if table == "paper_daily_report_table" and "id" in columns:
+            id_position = columns.index("id")
+            date_position = columns.index("date")
+
+            def upgrade_row(row: list) -> list:
+                row = list(row)
+                row[date_position] = get_report_date(row[date_position])
+                del row[id_position]
+
+                return row
+
+            return [column for column in columns if column != "id"], upgrade_row
+
+        if table == "paper_student_list_table" and "id" not in columns:
+            name_position = columns.index("name")
+
+            def upgrade_row(row: list) -> list:
+                self._listed_names.add(row[name_position])
+                return [self._get_student_id(row[name_position]), row[name_position], 1]
+
+            return ["id", "name", "enrolled"], upgrade_row
+
+        if table != "paper_student_list_table" and "name" in columns:
+            name_position = columns.index("name")
+
+            def upgrade_row(row: list) -> list:
+                row = list(row)
+                row[name_position] = self._get_student_id(row[name_position])
+
+                return row
+
+            return ["student_id" if column == "name" else column for column in columns], upgrade_row
+
+        return columns, None
+
+    def get_removed_students(self) -> list:
+        """
+        Finds the students named in the records and the reports of the snapshot, but not in its list of students,
+        as they were removed from the class.
+
+        :return: List of rows of "paper_student_list_table" for the removed students.
+        """
+        return [
+            [student_id, name, 0] for name, student_id in self._student_ids.items() if name not in self._listed_names
+        ]
+
+
+# Number of rows read from, or written to, the database at a time while taking or restoring a snapshot.
+SNAPSHOT_BATCH_SIZE = 1000
+
+# Errors raised by restore_snapshot() when the file is damaged or is not a snapshot, or its rows can not be loaded.
+SNAPSHOT_ERRORS = (OSError, EOFError, ValueError, KeyError, TypeError, DatabaseError)
+
+
+def create_snapshot(kept_path: str = None) -> str:
     """
-    student_list = list()
+    Saves all the data of the app into a single compressed snapshot inside BACKUP_FOLDER_PATH.
+    The snapshot is a gzip file of JSON lines: a header naming the databases, then for every table a line
+    naming the table and its columns, followed by a line for every row. Rows are read in batches and
+    written as they arrive. All the tables are read in one transaction, so the snapshot is consistent.
 
-    # date = None means: get student list for today's date.
-    if date is None:
-        # Try to get the list of students.
-        try:
-            use_information_database()
+    :param kept_path: Path of a snapshot which must not be removed while removing the oldest snapshots.
+    :return: Path of the snapshot.
+    """
+    import gzip
+    import json
 
-            get_student_list_query = "SELECT * FROM paper_student_list_table"
-            data_cursor.execute(get_student_list_query)
+    os.makedirs(BACKUP_FOLDER_PATH, exist_ok=True)
 
-            data = data_cursor.fetchall()
+    file_path = os.path.join(BACKUP_FOLDER_PATH, f"Snapshot {strftime('%Y-%m-%d %H-%M-%S')}.paper.gz")
+    databases = [database for database in SNAPSHOT_TABLES if data_storage.has_database(database)]
 
-        # If an error occurs, it means that the table is not created till now.
-        # So return the empty student list.
-        except server.ProgrammingError:
-            return student_list
-    else:
-        # Try to get student list from past attendance records.
+    # The snapshot is written under a temporary name, so that a snapshot which could not be completed
+    # is never taken for a complete one.
+    with data_storage.connection() as cursor, gzip.open(file_path + ".part", "wt", encoding="utf-8") as snapshot:
+        snapshot.write(json.dumps({"databases": databases}) + "\n")
+
+        data_storage.start_transaction()
         try:
-            use_attendance_database()
+            for database in databases:
+                tables = data_storage.get_table_list(database)
 
-            get_student_list_from_records_query = f"SELECT name FROM {date}"
-            data_cursor.execute(get_student_list_from_records_query)
+                for table, columns, create_table in SNAPSHOT_TABLES[database]:
+                    if table not in tables:
+                        continue
 
-            data = data_cursor.fetchall()
+                    snapshot.write(json.dumps({"database": database, "table": table, "columns": columns}) + "\n")
 
-        # If an error occurs, it means that the attendance record for the
-        # provided date does not exist.
-        # So return the empty student list.
-        except server.ProgrammingError:
-            return student_list
+                    get_rows_query = f"SELECT {', '.join(columns)} FROM {database}.{table}"
+                    cursor.stream(get_rows_query)
 
-    # If no error occurred, prepare student list from the data received from the database.
-    for student in data:
-        student_list.append(student[0])
+                    rows = cursor.fetchmany(SNAPSHOT_BATCH_SIZE)
+                    while rows:
+                        # Dates and decimals are written as text, which every storage engine reads back.
+                        snapshot.writelines(json.dumps(list(row), default=str) + "\n" for row in rows)
+                        rows = cursor.fetchmany(SNAPSHOT_BATCH_SIZE)
 
-    return student_list
+        # Nothing is written while taking a snapshot, so the transaction only has to be ended.
+        finally:
+            data_storage.rollback()
+
+    os.replace(file_path + ".part", file_path)
+    remove_old_snapshots(kept_path)
 
+    return file_path
 
-def get_past_attendance_records() -> list:
+
+def remove_old_snapshots(kept_path: str = None):
     """
-    Prepares list of all the tables present inside "paper_attendance_database".
-    Each table is a day's attendance record.
+    Removes the oldest snapshots, so that only the newest BACKUP_SNAPSHOT_COUNT snapshots are kept.
 
-    :return: List of all past attendance record tables.
+    :param kept_path: Path of a snapshot which is never removed, and is not counted.
     """
-    attendance_records = list()
+    kept_path = os.path.normcase(os.path.abspath(kept_path)) if kept_path is not None else None
+
+    # Snapshots are named after the time they were taken, so sorting by name sorts them by age.
+    snapshots = sorted(
+        file_name for file_name in os.listdir(BACKUP_FOLDER_PATH)
+        if file_name.startswith("Snapshot ") and file_name.endswith(".paper.gz")
+        and os.path.normcase(os.path.abspath(os.path.join(BACKUP_FOLDER_PATH, file_name))) != kept_path
+    )
+
+    for file_name in snapshots[:-BACKUP_SNAPSHOT_COUNT]:
+        os.remove(os.path.join(BACKUP_FOLDER_PATH, file_name))
+
 
-    # Get the list of all tables present inside the "paper_attendance_database" database.
-    get_table_list_query = 'SELECT table_name FROM information_schema.tables ' \
-                           'WHERE table_schema = "paper_attendance_database"'
-    data_cursor.execute(get_table_list_query)
+def keep_snapshot(file_path: str) -> str:
+    """
+    Renames a snapshot, so that it is never removed with the oldest snapshots.
 
-    data = data_cursor.fetchall()
+    :param file_path: Path of the snapshot.
+    :return: Path of the renamed snapshot, or the same path if it could not be renamed.
+    """
+    kept_file_path = os.path.join(os.path.dirname(file_path), "Kept " + os.path.basename(file_path))
 
-    for record in data:
-        attendance_records.append(record[0])
+    # Try to rename the snapshot.
+    try:
+        os.replace(file_path, kept_file_path)
+    # If an error occurs, the snapshot is left where it was.
+    except OSError:
+        return file_path
 
-    return attendance_records
+    return kept_file_path
 
 
-def rename_student_in_past_records(old_name: str, new_name: str):
+def restore_snapshot(file_path: str):
     """
-    Renames student in past attendance records after a naming change.
+    Replaces all the data of the app with the data saved in the provided snapshot.
+    The databases and tables are created again, then the rows are loaded in batches in a single transaction.
 
-    :param old_name: Old name of the student.
-    :param new_name: New name of the student.
+    :param file_path: Path of the snapshot.
     """
-    # Try renaming student in today's attendance record.
-    try:
-        use_attendance_database()
+    import gzip
+    import json
 
-        today = get_date()[0]
-        update_query = f"UPDATE {today} SET name = '{new_name}' WHERE name = '{old_name}'"
-        data_cursor.execute(update_query)
+    with gzip.open(file_path, "rt", encoding="utf-8") as snapshot:
+        # Read the header before anything is dropped, so that a file which is not a snapshot
+        # leaves the data as it is.
+        databases = json.loads(snapshot.readline())["databases"]
 
-    # If an error occurs, it means that the attendance has not been recorded for the day.
-    # Do nothing.
-    except server.ProgrammingError:
-        pass
+        # Every database and table named in the snapshot is checked before anything is dropped.
+        # Only the lines starting the rows of a table are read, the rows are left for the restore.
+        if not set(databases) <= set(SNAPSHOT_TABLES):
+            raise ValueError(f"The snapshot holds an unknown database: {databases}")
+
+        for line in snapshot:
+            if line.startswith("{"):
+                is_restored_table(json.loads(line), databases)
+
+        snapshot.seek(0)
+        snapshot.readline()
+
+        for database in SNAPSHOT_TABLES:
+            if data_storage.has_database(database):
+                data_storage.drop_database(database)
+
+        # Creating a table ends a transaction, so all the tables are created beforehand.
+        for database in databases:
+            data_storage.create_database(database)
+
+            for table, columns, create_table in SNAPSHOT_TABLES[database]:
+                create_table()
+
+        snapshot_upgrade = SnapshotUpgrade()
 
-    # Rename the student in past attendance records.
-    attendance_records = get_past_attendance_records()
-    for record in attendance_records:
-        # Try renaming the student in all the past attendance records.
+        data_storage.start_transaction()
         try:
-            update_name_in_past_record_table_query = f"UPDATE {record} " \
-                                                     f"SET name = '{new_name}' " \
-                                                     f"WHERE name = '{old_name}'"
-            data_cursor.execute(update_name_in_past_record_table_query)
+            insert_rows_query = None
+            rows = list()
 
-        # If an error occurs, it means that the student was not a part of the class till the
-        # corresponding date.
-        # Do nothing.
-        except server.ProgrammingError:
-            pass
+            for line in snapshot:
+                item = json.loads(line)
 
+                # A dictionary starts the rows of the next table.
+                if isinstance(item, dict):
+                    if rows:
+                        data_cursor.executemany(insert_rows_query, rows)
+                        rows = list()
 
-def export_data():
-    """Exports attendance data to external file on hard-disk."""
-    export_data_dialog = ExportDataDialog()
-    export_data_dialog.exec()
+                    # Older snapshots may hold tables which are no longer saved, like "paper_export_manifest_table".
+                    # Their rows are skipped.
+                    if not is_restored_table(item, databases):
+                        insert_rows_query = None
+                        continue
+
+                    columns, upgrade_row = snapshot_upgrade.prepare(item["table"], item["columns"])
+
+                    # The columns are written into the statement too, so each of them must be a column of the table.
+                    table_columns = data_storage.get_column_list(item["database"], item["table"])
+                    if len(set(columns)) != len(columns) or not set(columns) <= set(table_columns):
+                        raise ValueError(f"The snapshot holds unknown columns of {item['table']}: {columns}")
+
+                    # Rows added by the function creating the table, like the default settings, are removed.
+                    # A table which is not in the snapshot keeps them.
+                    data_cursor.execute(f"DELETE FROM {item['database']}.{item['table']}")
+
+                    insert_rows_query = f"INSERT INTO {item['database']}.{item['table']} " \
+                                        f"({', '.join(columns)}) " \
+                                        f"VALUES ({', '.join(['%s'] * len(columns))})"
+                elif insert_rows_query is not None:
+                    rows.append(item if upgrade_row is None else upgrade_row(item))
+
+                    if len(rows) == SNAPSHOT_BATCH_SIZE:
+                        data_cursor.executemany(insert_rows_query, rows)
+                        rows = list()
+
+            if rows:
+                data_cursor.executemany(insert_rows_query, rows)
+
+            removed_students = snapshot_upgrade.get_removed_students()
+            if removed_students:
+                add_students_query = "INSERT INTO paper_information_database.paper_student_list_table " \
+                                     "(id, name, enrolled) VALUES (%s, %s, %s)"
+                data_cursor.executemany(add_students_query, removed_students)
+
+        # If an error occurs, undo the rows loaded so far and let the error propagate.
+        except SNAPSHOT_ERRORS:
+            data_storage.rollback()
+            raise
+
+        data_storage.commit()
+
+    clear_configuration_cache()
+    forget_record_tables()
+    student_roster.clear()
 
 
 def write_daily_report(date: str):
@@ -387,17 +2701,19 @@ def write_daily_report(date: str):
 
     :param date: The date for which report should be prepared.
     """
-    use_attendance_database()
+    # Get the number of students and the number of students present on the provided date
+    # in a single pass over the day's records.
+    get_counts_query = "SELECT count(*), SUM(state = %s) FROM paper_attendance_database.paper_attendance_table " \
+                       "WHERE date = %s"
+    data_cursor.execute(get_counts_query, ("P", date))
+    student_count, present_count = data_cursor.fetchone()
 
-    # Get the number of students present on the provided date.
-    get_present_count_query = f"SELECT count(*) FROM {date} WHERE state = 'P'"
-    data_cursor.execute(get_present_count_query)
-    present_count = data_cursor.fetchone()[0]
+    # If there are no records for the provided date, there is nothing to report.
+    if student_count == 0:
+        return
 
-    # Get the number of students absent on the provided date.
-    get_absent_count_query = f"SELECT count(*) FROM {date} WHERE state = 'A'"
-    data_cursor.execute(get_absent_count_query)
-    absent_count = data_cursor.fetchone()[0]
+    present_count = int(present_count)
+    absent_count = student_count - present_count
 
     # The total number of students is calculated as (present_count + absent_count) to get
     # the total number of students on the provided date.
@@ -406,75 +2722,209 @@ def write_daily_report(date: str):
     # This is done to facilitate displaying report of a past date.
     attendance_percentage = round((present_count / (present_count + absent_count)) * 100, 2)
 
-    # Try creating the daily report table.
-    try:
-        create_daily_report_table()
+    # Write the report for the provided date, replacing the existing report if there is one.
+    write_report_query = data_storage.upsert_query("paper_reports_database.paper_daily_report_table",
+                                                   ["date", "present", "absent", "attendance_percentage"],
+                                                   "date")
+    data_cursor.execute(write_report_query,
+                        (get_report_date(date), present_count, absent_count, attendance_percentage))
 
-    # If an error occurs, it means that the table already exists.
-    # Do nothing.
-    except server.ProgrammingError:
-        pass
 
-    use_reports_database()
-    # Try writing report with the given parameters for the provided date.
-    try:
-        write_report_query = "INSERT INTO paper_daily_report_table(date, present, absent, attendance_percentage) " \
-                             f"VALUES ('{date}', {present_count}, {absent_count}, {attendance_percentage})"
-        data_cursor.execute(write_report_query)
+def record_attendance(date: str, attendance_record: dict):
+    """
+    Writes the attendance record of the whole class for the provided date.
+
+    :param date: The date of the attendance record.
+    :param attendance_record: The attendance record for the day.
+    """
+    # All the rows are sent as a single multi-row insert.
+    record_attendance_query = "INSERT INTO paper_attendance_database.paper_attendance_table " \
+                              "(date, student_id, state) VALUES (%s, %s, %s)"
+    data_cursor.executemany(
+        record_attendance_query,
+        [(date, student_roster.get_student_id(student), attendance_record[student]) for student in attendance_record]
+    )
 
-    # If an error occurs, it means that report data already exists for the provided date.
-    # So update the data for the provided date.
-    except server.IntegrityError:
-        update_report_query = f"UPDATE paper_daily_report_table " \
-                              f"SET present = {present_count}, absent = {absent_count}, " \
-                              f"attendance_percentage = {attendance_percentage} " \
-                              f"WHERE date = '{date}'"
-        data_cursor.execute(update_report_query)
+    mark_record_changed(date)
 
 
 def write_student_report(attendance_record: dict):
     """
-    Prepares/ updates individual student attendance report.
+    Prepares/ updates individual student attendance report.
+
+    :param attendance_record: The attendance record for the day.
+    """
+    # Add report data for a new admit, or update the report data of an old student, in
+    # a single multi-row statement for the whole class.
+    # A "present" student gets 1 added to both the total days and the days present, while an
+    # "absent" student gets 1 added to the total days only.
+    write_report_query = data_storage.upsert_query("paper_reports_database.paper_student_report_table",
+                                                   ["student_id", "total_days", "days_present"],
+                                                   key="student_id", accumulate=True)
+    data_cursor.executemany(
+        write_report_query,
+        [(student_roster.get_student_id(student), 1, 1 if attendance_record[student] == "P" else 0)
+         for student in attendance_record]
+    )
+
+
+def write_period_reports(date: str, attendance_record: dict):
+    """
+    Adds the attendance record of a day to the reports of the class and of every student
+    for the week, month and term which the day falls in.
+
+    :param date: The date of the attendance record.
+    :param attendance_record: The attendance record for the day.
+    """
+    report_date = datetime.date.fromisoformat(get_report_date(date))
+    period_starts = [(period, str(get_period_start(period, report_date))) for period in REPORT_PERIODS]
+
+    present_count = sum(1 for student in attendance_record if attendance_record[student] == "P")
+
+    # The day is added to the existing report of each period, or starts a new one.
+    write_report_query = data_storage.upsert_query("paper_reports_database.paper_period_report_table",
+                                                   ["period", "period_start", "days", "student_days",
+                                                    "present_days"],
+                                                   key=["period", "period_start"], accumulate=True)
+    data_cursor.executemany(
+        write_report_query,
+        [(period, period_start, 1, len(attendance_record), present_count) for period, period_start in period_starts]
+    )
+
+    write_student_report_query = data_storage.upsert_query(
+        "paper_reports_database.paper_student_period_report_table",
+        ["period", "period_start", "student_id", "total_days", "days_present"],
+        key=["period", "period_start", "student_id"], accumulate=True
+    )
+    data_cursor.executemany(
+        write_student_report_query,
+        [(period, period_start, student_roster.get_student_id(student), 1,
+          1 if attendance_record[student] == "P" else 0)
+         for period, period_start in period_starts for student in attendance_record]
+    )
+
+
+def change_period_reports(date: str, student_id: int, present_change: int):
+    """
+    Updates the reports for the week, month and term of a day, after the attendance of a student
+    on that day is edited.
+
+    :param date: The date of the attendance record.
+    :param student_id: The "id" of the student whose attendance changed.
+    :param present_change: 1 if the student is now present, or -1 if the student is now absent.
+    """
+    report_date = datetime.date.fromisoformat(get_report_date(date))
+    period_starts = [(period, str(get_period_start(period, report_date))) for period in REPORT_PERIODS]
+
+    update_report_query = "UPDATE paper_reports_database.paper_period_report_table " \
+                          "SET present_days = present_days + %s " \
+                          "WHERE period = %s AND period_start = %s"
+    data_cursor.executemany(
+        update_report_query,
+        [(present_change, period, period_start) for period, period_start in period_starts]
+    )
+
+    update_student_report_query = "UPDATE paper_reports_database.paper_student_period_report_table " \
+                                  "SET days_present = days_present + %s " \
+                                  "WHERE period = %s AND period_start = %s AND student_id = %s"
+    data_cursor.executemany(
+        update_student_report_query,
+        [(present_change, period, period_start, student_id) for period, period_start in period_starts]
+    )
+
+
+# Form classes made from the .ui files, by path. Each file is compiled at most once per process.
+ui_form_classes = dict()
+
+
+def get_ui_form_class(ui_path: str) -> type:
+    """
+    Gets the form class made from a .ui file. The file is compiled into a Python module inside
+    UI_CACHE_FOLDER_PATH, which is imported from then on, so the XML is not parsed on every start.
+
+    :param ui_path: Path of the .ui file.
+    :return: The form class, whose setupUi() builds the user interface inside a widget.
+    """
+    if ui_path in ui_form_classes:
+        return ui_form_classes[ui_path]
+
+    module_name = os.path.splitext(os.path.basename(ui_path))[0]
+    module_path = os.path.join(UI_CACHE_FOLDER_PATH, module_name + ".py")
+
+    # Try to compile the .ui file, if it changed since it was last compiled, and import the module.
+    try:
+        if not os.path.exists(module_path) or os.path.getmtime(module_path) < os.path.getmtime(ui_path):
+            # PyQt6.uic is needed only when the .ui file has to be compiled, so it is imported only then.
+            from PyQt6 import uic
+
+            os.makedirs(UI_CACHE_FOLDER_PATH, exist_ok=True)
+
+            with open(module_path + ".part", "w", encoding="utf-8") as module_file:
+                uic.compileUi(ui_path, module_file)
+
+            os.replace(module_path + ".part", module_path)
+
+        specification = importlib.util.spec_from_file_location(module_name, module_path)
+        module = importlib.util.module_from_spec(specification)
+        specification.loader.exec_module(module)
+
+        form_class = next(value for name, value in vars(module).items() if name.startswith("Ui_"))
+
+    # If an error occurs, it means that the cache folder can not be written to.
+    # So compile the .ui file in memory.
+    except OSError:
+        from PyQt6 import uic
+
+        form_class = uic.loadUiType(ui_path)[0]
+
+    ui_form_classes[ui_path] = form_class
+    return form_class
+
+
+def load_ui(ui_path: str, widget: QtWidgets.QWidget):
+    """
+    Builds the user interface described by a .ui file inside the widget, like uic.loadUi(),
+    using the form class compiled from the file.
+
+    :param ui_path: Path of the .ui file.
+    :param widget: The widget to build the user interface in.
+    """
+    with time_task(f"Building {os.path.basename(ui_path)}"):
+        form = get_ui_form_class(ui_path)()
+        form.setupUi(widget)
+
+    # Like uic.loadUi(), make every element of the user interface an attribute of the widget.
+    vars(widget).update(vars(form))
+
+
+# Dialogs which are opened often are made once and shown again, instead of being built every time.
+reusable_dialogs = dict()
+
+
+def get_dialog(dialog_class: type) -> QtWidgets.QDialog:
+    """
+    Gets the dialog of the provided class, making it when it is needed for the first time.
+    A dialog shown before is made ready to be shown again by its reset_state(), if it has one.
 
-    :param attendance_record: The attendance record for the day.
+    :param dialog_class: Class of the dialog.
+    :return: The dialog.
     """
-    for student in attendance_record:
-        if attendance_record[student] == "P":
-            # Try adding report data for a "present" student. This will be done only when the student
-            # is a new admit.
-            try:
-                add_record_query = f"INSERT INTO paper_student_report_table VALUES ('{student}', 1, 1)"
-                data_cursor.execute(add_record_query)
-
-            # If an error occurs, it means that the student is an old student.
-            # So update her/ his report data.
-            except server.IntegrityError:
-                update_present_student_record_query = "UPDATE paper_student_report_table " \
-                                                      "SET total_days = total_days + 1, " \
-                                                      "days_present = days_present + 1 " \
-                                                      f"WHERE name = '{student}'"
-                data_cursor.execute(update_present_student_record_query)
+    dialog = reusable_dialogs.get(dialog_class)
 
-        else:
-            # Try adding report data for an "absent" student. This will be done only when the student
-            # is a new admit.
-            try:
-                add_record_query = f"INSERT INTO paper_student_report_table VALUES ('{student}', 1, 0)"
-                data_cursor.execute(add_record_query)
+    if dialog is None:
+        dialog = dialog_class()
+        reusable_dialogs[dialog_class] = dialog
+
+    elif hasattr(dialog, "reset_state"):
+        dialog.reset_state()
 
-            # If an error occurs, it means that the student is an old student.
-            # So update her/ his report data.
-            except server.IntegrityError:
-                update_absent_student_record_query = "UPDATE paper_student_report_table " \
-                                                     "SET total_days = total_days + 1 " \
-                                                     f"WHERE name = '{student}'"
-                data_cursor.execute(update_absent_student_record_query)
+    return dialog
 
 
 class CreatePINDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/CreatePINDialog_ui.ui", self)
+        load_ui("src/layout/CreatePINDialog_ui.ui", self)
 
         self._created = False
 
@@ -494,22 +2944,19 @@ class CreatePINDialog(QtWidgets.QDialog):
         provided_pin = self.create_pin_line_edit.text().strip()
 
         if len(provided_pin) == 4:
-            use_information_database()
-
-            set_pin_query = f"INSERT INTO paper_data_table(PIN) VALUES ('{provided_pin}')"
-            data_cursor.execute(set_pin_query)
+            create_pin(provided_pin)
 
             self._created = True
             self.close()
 
-            pin_saved_message_dialog = PINSavedMessageDialog()
+            pin_saved_message_dialog = get_dialog(PINSavedMessageDialog)
             pin_saved_message_dialog.exec()
 
 
 class UnlockAppDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/UnlockAppDialog_ui.ui", self)
+        load_ui("src/layout/UnlockAppDialog_ui.ui", self)
 
         self._valid = False
 
@@ -541,18 +2988,401 @@ class UnlockAppDialog(QtWidgets.QDialog):
 class PINSavedMessageDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/PINSavedMessageDialog_ui.ui", self)
+        load_ui("src/layout/PINSavedMessageDialog_ui.ui", self)
 
         self.close_button.clicked.connect(self.close)
 
 
+class StudentTableModel(QtCore.QAbstractTableModel):
+    """
+    A list of students shown in a QTreeView. Every row is a tuple of values, and the first column shows
+    the position of the row, starting from 1, followed by the values.
+    The rows are changed by set_rows(), which signals only the rows that changed, so that the view updates
+    those rows alone instead of being filled again.
+    """
+
+    def __init__(self, headers: list, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self._headers = headers
+        self._rows = list()
+
+        # If set, the message is shown in place of the rows.
+        self._message = None
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+
+        return 1 if self._message is not None else len(self._rows)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+
+        return 1 if self._message is not None else len(self._headers)
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation,
+                   role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return "" if self._message is not None else self._headers[section]
+
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if self._message is not None:
+            return self._message
+
+        return self.text(index.row(), index.column())
+
+    def get_name(self, position: int) -> str:
+        """
+        Gets the name of the student in a row.
+
+        :param position: Position of the row.
+        :return: Name of the student.
+        """
+        return self._rows[position][0]
+
+    def text(self, position: int, column: int) -> str:
+        """
+        Gets the text shown in a cell.
+
+        :param position: Position of the row.
+        :param column: Column of the cell.
+        :return: Text of the cell.
+        """
+        if column == 0:
+            return str(position + 1)
+
+        return str(self._rows[position][column - 1])
+
+    def show_message(self, message: str):
+        """
+        Shows a message, such as "No data found!", in place of the rows.
+
+        :param message: The message.
+        """
+        self.beginResetModel()
+        self._rows = list()
+        self._message = message
+        self.endResetModel()
+
+    def set_rows(self, rows: list):
+        """
+        Changes the rows to the provided rows. The rows at the start and at the end which are the same are kept,
+        the rows in between are changed, removed or inserted, and only those are signalled to the view.
+
+        :param rows: The new rows.
+        """
+        if self._message is not None:
+            self.beginResetModel()
+            self._rows = list(rows)
+            self._message = None
+            self.endResetModel()
+            return
+
+        old_rows = self._rows
+
+        first = 0
+        while first < min(len(old_rows), len(rows)) and old_rows[first] == rows[first]:
+            first += 1
+
+        old_end = len(old_rows)
+        new_end = len(rows)
+        while old_end > first and new_end > first and old_rows[old_end - 1] == rows[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+
+        # The rows which differ are changed where both the lists have them, then the rest are removed or inserted.
+        changed_end = min(old_end, new_end)
+        if changed_end > first:
+            old_rows[first:changed_end] = rows[first:changed_end]
+            self.dataChanged.emit(self.index(first, 0), self.index(changed_end - 1, self.columnCount() - 1))
+
+        if old_end > new_end:
+            self.beginRemoveRows(QtCore.QModelIndex(), changed_end, old_end - 1)
+            del old_rows[changed_end:old_end]
+            self.endRemoveRows()
+
+        elif new_end > old_end:
+            self.beginInsertRows(QtCore.QModelIndex(), changed_end, new_end - 1)
+            old_rows[changed_end:changed_end] = rows[changed_end:new_end]
+            self.endInsertRows()
+
+        # The positions of the rows after the removed or inserted rows have changed.
+        if old_end != new_end and new_end < len(old_rows):
+            self.dataChanged.emit(self.index(new_end, 0), self.index(len(old_rows) - 1, self.columnCount() - 1))
+
+
+class ClassListModel(StudentTableModel):
+    """The students of the Class with their roll numbers. Every row is the name of a student."""
+
+    def __init__(self, parent: QtCore.QObject = None):
+        super().__init__(["Roll", "Name"], parent)
+
+    def get_name(self, position: int) -> str:
+        return self._rows[position]
+
+    def text(self, position: int, column: int) -> str:
+        if column == 0:
+            return str(position + 1)
+
+        return self._rows[position]
+
+
+class AttendanceListModel(StudentTableModel):
+    """The students of the Class with a check box for marking each present. Every row is (name, present)."""
+
+    def __init__(self, parent: QtCore.QObject = None):
+        super().__init__(["Present", "Roll", "Name"], parent)
+
+    def text(self, position: int, column: int) -> str:
+        if column == 1:
+            return str(position + 1)
+        elif column == 2:
+            return self._rows[position][0]
+
+        return ""
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.CheckStateRole and index.column() == 0 and self._message is None:
+            if self._rows[index.row()][1]:
+                return QtCore.Qt.CheckState.Checked
+
+            return QtCore.Qt.CheckState.Unchecked
+
+        return super().data(index, role)
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.column() == 0:
+            flags |= QtCore.Qt.ItemFlag.ItemIsUserCheckable
+
+        return flags
+
+    def setData(self, index: QtCore.QModelIndex, value, role: int = QtCore.Qt.ItemDataRole.EditRole) -> bool:
+        if role != QtCore.Qt.ItemDataRole.CheckStateRole or index.column() != 0:
+            return False
+
+        name = self._rows[index.row()][0]
+        self._rows[index.row()] = (name, QtCore.Qt.CheckState(value) == QtCore.Qt.CheckState.Checked)
+        self.dataChanged.emit(index, index, [role])
+
+        return True
+
+    def set_students(self, names: list, present: bool):
+        """
+        Lists the provided students. The students who are listed already keep their marks.
+
+        :param names: Names of the students, in the order of their roll numbers.
+        :param present: Whether the students who are not listed yet are marked as present.
+        """
+        marks = dict(self._rows)
+        self.set_rows([(name, marks.get(name, present)) for name in names])
+
+    def mark_all(self, present: bool):
+        """
+        Marks all the students as present or as absent.
+
+        :param present: Whether the students are marked as present.
+        """
+        self.set_rows([(name, present) for name, marked in self._rows])
+
+    def get_attendance_record(self) -> dict:
+        """
+        Prepares the attendance record marked by the user.
+
+        :return: Dictionary with "P" or "A" for every student.
+        """
+        return {name: "P" if present else "A" for name, present in self._rows}
+
+
+class StudentReportModel(StudentTableModel):
+    """
+    The attendance report of every student, with a remark icon for low and high attendance.
+    Every row is (name, days present, total days, percentage).
+    """
+
+    def __init__(self, parent: QtCore.QObject = None):
+        super().__init__(["Roll", "Name", "Days Present", "Total Days", "Percentage", "Remark"], parent)
+
+        self._minimum_attendance = None
+
+        # Icons for the remarks, by path, each loaded once.
+        self._remark_icons = dict()
+
+    def text(self, position: int, column: int) -> str:
+        if column == 4:
+            return str(self._rows[position][3]) + "%"
+        elif column == 5:
+            return ""
+
+        return super().text(position, column)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DecorationRole and index.column() == 5 and self._message is None:
+            return self.get_remark_icon(self._rows[index.row()][3])
+
+        return super().data(index, role)
+
+    def get_remark_icon(self, percentage: float) -> QtGui.QIcon or None:
+        """
+        Gets the remark icon for an attendance percentage.
+
+        :param percentage: Attendance percentage of a student.
+        :return: The icon, or None if there is no remark.
+        """
+        if 50 < percentage <= self._minimum_attendance:
+            icon_path = "src/icons/icons8-error-96.png"
+        elif percentage > 90:
+            icon_path = "src/icons/icons8-prize-96.png"
+        elif percentage <= 50:
+            icon_path = "src/icons/icons8-high-priority-96.png"
+        else:
+            return None
+
+        if icon_path not in self._remark_icons:
+            self._remark_icons[icon_path] = QtGui.QIcon(icon_path)
+
+        return self._remark_icons[icon_path]
+
+    def set_report(self, student_report: list, minimum_attendance: int):
+        """
+        Shows the provided report.
+
+        :param student_report: List of (name, total days, days present) of every student.
+        :param minimum_attendance: Minimum attendance percentage, below which a student is remarked.
+        """
+        # The remarks of all the students change with the minimum attendance.
+        if minimum_attendance != self._minimum_attendance:
+            self._minimum_attendance = minimum_attendance
+
+            if self._rows:
+                self.dataChanged.emit(self.index(0, 5), self.index(len(self._rows) - 1, 5))
+
+        rows = list()
+        for student in student_report:
+            student_name = student[0]
+            total_days = student[1]
+            days_present = student[2]
+
+            rows.append((student_name, days_present, total_days, round((days_present / total_days) * 100, 2)))
+
+        self.set_rows(rows)
+
+
+class StudentFilterModel(QtCore.QSortFilterProxyModel):
+    """Shows only the students found by a search, out of a StudentTableModel."""
+
+    def __init__(self, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        # Names of the students shown, or None to show every student.
+        self._matches = None
+
+    def set_matches(self, matches: set or None):
+        """
+        Shows only the provided students.
+
+        :param matches: Names of the students to show, or None to show every student.
+        """
+        if matches is None and self._matches is None:
+            return
+
+        self._matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
+        return self._matches is None or self.sourceModel().get_name(source_row) in self._matches
+
+
+class StudentSearch(QtCore.QObject):
+    """
+    Searches the students as the user types in a line edit. The search runs once the user stops typing
+    for DELAY milliseconds, using a StudentSearchIndex, and shows the students found through a StudentFilterModel.
+    """
+
+    DELAY = 150
+
+    def __init__(self, line_edit: QtWidgets.QLineEdit, filter_model: StudentFilterModel,
+                 search_index: StudentSearchIndex, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self._line_edit = line_edit
+        self._filter_model = filter_model
+        self._search_index = search_index
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DELAY)
+        self._timer.timeout.connect(self.search)
+
+        self._line_edit.textChanged.connect(self._timer.start)
+
+    def search(self):
+        """Shows the students found for the text in the line edit."""
+        self._timer.stop()
+        self._filter_model.set_matches(self._search_index.find(self._line_edit.text()))
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/MainWindow_ui.ui", self)
+        load_ui("src/layout/MainWindow_ui.ui", self)
         self.show()
 
+        if PROFILE_TIMING:
+            print(f"Main window shown: {(perf_counter() - STARTUP_TIME) * 1000:.1f} ms after start")
+
         self.today = get_date()[0]
+        self.backup_scheduler = BackupScheduler(self)
+
+        # The "Attendance Chart" graph is made when the chart is first shown.
+        # Its days are counted from the first day with a report. Only the points of a window of days
+        # around the days in view are read, and kept in arrays.
+        self.graph_widget = None
+        self.graph_plot = None
+        self.graph_first_date = None
+        self.graph_window = None
+        self.graph_x = None
+        self.graph_y = None
+
+        # The lists of students are shown through models, which change only the rows that change.
+        self.class_list_model = ClassListModel(self)
+        self.attendance_list_model = AttendanceListModel(self)
+        self.present_report_model = StudentTableModel(["No.", "Name", "Roll"], self)
+        self.present_tree_view.setModel(self.present_report_model)
+        self.absent_report_model = StudentTableModel(["No.", "Name", "Roll"], self)
+        self.absent_tree_view.setModel(self.absent_report_model)
+        self.student_report_model = StudentReportModel(self)
+        self.student_report_tree_view.setModel(self.student_report_model)
+        self.period_report_model = StudentReportModel(self)
+        self.period_report_tree_view.setModel(self.period_report_model)
+
+        # The students on the Class and Attendance screens are searched through a shared index of their names.
+        self.student_search_index = StudentSearchIndex()
+
+        self.class_filter_model = StudentFilterModel(self)
+        self.class_filter_model.setSourceModel(self.class_list_model)
+        self.students_tree_view.setModel(self.class_filter_model)
+        self.class_search = StudentSearch(self.search_student_class_line_edit, self.class_filter_model,
+                                          self.student_search_index, self)
+
+        self.attendance_filter_model = StudentFilterModel(self)
+        self.attendance_filter_model.setSourceModel(self.attendance_list_model)
+        self.mark_attendance_tree_view.setModel(self.attendance_filter_model)
+        self.attendance_search = StudentSearch(self.search_student_attendance_line_edit, self.attendance_filter_model,
+                                               self.student_search_index, self)
+
+        # Every screen is set up when it is first shown. The screens not set up yet are kept here, with
+        # the functions setting them up. The data of those screens is read in the background meanwhile.
+        self.screen_setup_functions = dict()
+        self.screen_data_thread = ScreenDataThread(self.today, self)
+        self.options_tabWidget.currentChanged.connect(self.setup_current_screen)
 
         # Try creating the "paper_information_database" database.
         # Try creating the "paper_data_table" table within the database.
@@ -564,9 +3394,28 @@ class MainWindow(QtWidgets.QMainWindow):
         # If an error occurs, it means that the application was run before and
         # the corresponding database and table exists.
         # Do nothing.
-        except server.DatabaseError:
+        except DatabaseError:
             pass
 
+        # Give an "id" to the students kept by older versions of the app, which referred to them by name.
+        students_migrated = migrate_student_ids()
+
+        # If the "paper_attendance_database" database exists, move the attendance records kept
+        # by older versions of the app into the table which holds the attendance records of
+        # all the days.
+        # The schema of the records and the reports is checked here once, so that saving and editing
+        # attendance do not have to.
+        if data_storage.has_database("paper_attendance_database"):
+            prepare_record_tables()
+            records_migrated = migrate_attendance_records()
+            migrate_daily_reports()
+            migrate_period_reports()
+
+            # The reports kept by older versions may not match the records they were moved with,
+            # so they are checked once after a migration. Else they are checked only when the user asks.
+            if students_migrated or records_migrated:
+                repair_student_report()
+
         # As the PIN is not created/ verified till now, disable:
         #   1. Create Class button
         #   2. Attendance tab
@@ -587,6 +3436,12 @@ class MainWindow(QtWidgets.QMainWindow):
         if get_class_name() is not None:
             self.setup()
 
+    def closeEvent(self, event):
+        """Waits for a running backup, and for the screen data being read, to complete before the window closes."""
+        self.backup_scheduler.stop()
+        self.screen_data_thread.wait()
+        super().closeEvent(event)
+
     def authorize(self):
         """Authorize user with correct PIN."""
         pin = get_pin()
@@ -616,7 +3471,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.options_tabWidget.setTabEnabled(3, True)
 
         # Check whether the student list is empty or not.
-        if get_student_list():
+        if len(student_roster) > 0:
             # If student list is not empty, set the start up tab as the
             # "Attendance" tab to mark attendance.
             self.options_tabWidget.setCurrentIndex(1)
@@ -626,73 +3481,157 @@ class MainWindow(QtWidgets.QMainWindow):
             # students in the class.
             self.options_tabWidget.setCurrentIndex(0)
 
-        self.setup_class_screen()
-        self.setup_attendance_screen()
-        self.setup_reports_screen()
-        self.setup_settings_screen()
+        # Set up only the screen shown now. The other screens are set up when they are first shown.
+        self.screen_setup_functions = {
+            self.class_tab: self.setup_class_screen,
+            self.attendance_tab: self.setup_attendance_screen,
+            self.reports_tab: self.setup_reports_screen,
+            self.settings_tab: self.setup_settings_screen
+        }
+        self.setup_current_screen()
 
-        # Try to set "paper_attendance_database" as the current working database.
-        # If no error occurs, it means that the database exists along with attendance
-        # records. So leave "Edit Data" and "Export Data" buttons in enabled state.
-        try:
-            use_attendance_database()
+        # Read the data of the other screens in the background, so that they are quick to show.
+        self.screen_data_thread.start()
 
-        # If an error occurs, it means that the database does not exist.
-        # Hence, there are no attendance records.
+        # If the "paper_attendance_database" database exists, it means that there are attendance
+        # records. So leave "Edit Data" and "Export Data" buttons in enabled state.
+        # If it does not exist, it means that there are no attendance records.
         # So disable "Edit Data" and "Export Data" buttons.
-        except server.ProgrammingError:
+        if not data_storage.has_database("paper_attendance_database"):
             self.edit_data_button.setEnabled(False)
             self.export_data_button.setEnabled(False)
+            self.export_format_combo_box.setEnabled(False)
+
+        # Run the automatic backup, if it is due, once the window is ready to use.
+        self.backup_scheduler.start()
+
+    def setup_current_screen(self):
+        """Sets up the screen shown, if it is shown for the first time."""
+        screen = self.options_tabWidget.currentWidget()
+        setup_screen = self.screen_setup_functions.pop(screen, None)
+
+        if setup_screen is not None:
+            task = self.options_tabWidget.tabText(self.options_tabWidget.currentIndex()) + " screen"
+            with count_queries(task), time_task(task):
+                setup_screen()
+
+    def is_screen_set_up(self, screen: QtWidgets.QWidget) -> bool:
+        """
+        Tells whether the screen has been set up. Screens which are not set up yet need not be updated,
+        as they show the current data when they are set up.
+
+        :param screen: Tab of the screen.
+        :return: True if the screen is set up, else False.
+        """
+        return screen not in self.screen_setup_functions
+
+    def read_screen_data(self, key: tuple, read, *arguments):
+        """
+        Gets data for a screen. The data read in the background is used, once, if it is there.
+        Otherwise, the data is read now.
+
+        :param key: Key of the data in ScreenDataThread.
+        :param read: Function reading the data.
+        :param arguments: Arguments of the function, other than the cursor.
+        :return: The data.
+        """
+        # The data being read in the background is waited for, as reading it again would take as long.
+        self.screen_data_thread.wait()
+
+        if key in self.screen_data_thread.data:
+            return self.screen_data_thread.data.pop(key)
+
+        return read(*arguments)
 
     def setup_class_screen(self):
         """Setup all the visual elements on "Class" screen."""
-        self.students_tree_widget.setHeaderLabels(["Roll", "Name"])
-        self.students_tree_widget.setColumnWidth(0, 40)
-        self.students_tree_widget.setColumnWidth(1, 80)
+        self.students_tree_view.setColumnWidth(0, 40)
+        self.students_tree_view.setColumnWidth(1, 80)
         self.class_name_label.setText(get_class_name())
         self.populate_student_list_on_class_screen()
         self.set_student_count()
-        self.search_student_class_line_edit.textChanged.connect(self.search_student_in_student_list)
         self.rename_class_button.clicked.connect(self.rename_class)
         self.delete_class_button.clicked.connect(self.confirm_delete)
         self.edit_class_button.clicked.connect(self.edit_class)
-        self.export_data_button.clicked.connect(export_data)
-        self.backup_data()
+        self.export_format_combo_box.addItems(["Daily files", "Single table", "Single table (compressed)"])
+        self.export_data_button.clicked.connect(self.export_data_in_chosen_format)
 
     def setup_attendance_screen(self):
         """Setup all the visual elements on Attendance screen."""
-        self.search_student_attendance_line_edit.textChanged.connect(self.search_student_in_attendance_list)
         self.edit_data_button.clicked.connect(self.show_edit_attendance_data_dialog)
         self.edit_attendance_button.clicked.connect(self.show_edit_attendance_data_dialog)
         self.date_label.setText(strftime("%d %B, %Y"))
 
-        # Try to get all data from today's attendance record.
-        # If no error occurs, set the "Attendance" tab to show
-        # that the attendance has been recorded for the day.
-        try:
-            use_attendance_database()
-
-            test_for_table_query = f"SELECT * FROM {self.today}"
-            data_cursor.execute(test_for_table_query)
-
+        # If the attendance has been recorded for the day, set the "Attendance" tab to show it.
+        if self.read_screen_data(("attendance recorded", self.today), is_attendance_recorded, self.today):
             self.attendance_stackedWidget.setCurrentIndex(1)
 
-        # If an error occurs, it means that the attendance has not been recorded for the day.
-        # So set the "Attendance" tab to take attendance.
-        except server.ProgrammingError:
+        # If not, set the "Attendance" tab to take attendance.
+        else:
             self.attendance_stackedWidget.setCurrentIndex(0)
             self.populate_student_list_on_attendance_screen()
 
-            self.mark_attendance_tree_widget.setHeaderLabels(["Present", "Roll", "Name"])
-            self.mark_attendance_tree_widget.setColumnWidth(0, 50)
-            self.mark_attendance_tree_widget.setColumnWidth(1, 40)
-            self.mark_attendance_tree_widget.setColumnWidth(2, 80)
+            self.mark_attendance_tree_view.setColumnWidth(0, 50)
+            self.mark_attendance_tree_view.setColumnWidth(1, 40)
+            self.mark_attendance_tree_view.setColumnWidth(2, 80)
 
             self.save_button.clicked.connect(self.save_attendance)
             self.clear_button.clicked.connect(self.clear_student_list_attendance_screen)
 
     def setup_reports_screen(self):
         """Setup all the visual elements on Reports screen."""
+        raw_date = get_date()[1]
+        self.report_date_date_edit.setDate(QtCore.QDate(raw_date[2], raw_date[1], raw_date[0]))
+        self.get_report_button.clicked.connect(self.display_report)
+
+        self.student_report_tree_view.setColumnWidth(0, 40)
+        self.student_report_tree_view.setColumnWidth(1, 150)
+        self.student_report_tree_view.setColumnWidth(2, 100)
+        self.student_report_tree_view.setColumnWidth(3, 100)
+        self.student_report_tree_view.setColumnWidth(4, 100)
+        self.student_report_tree_view.setColumnWidth(5, 40)
+
+        self.period_combo_box.addItems(["Week", "Month", "Term"])
+        self.period_date_date_edit.setDate(QtCore.QDate(raw_date[2], raw_date[1], raw_date[0]))
+        self.period_combo_box.currentIndexChanged.connect(self.display_period_report)
+        self.get_period_report_button.clicked.connect(self.display_period_report)
+
+        self.period_report_tree_view.setColumnWidth(0, 40)
+        self.period_report_tree_view.setColumnWidth(1, 150)
+        self.period_report_tree_view.setColumnWidth(2, 100)
+        self.period_report_tree_view.setColumnWidth(3, 100)
+        self.period_report_tree_view.setColumnWidth(4, 100)
+        self.period_report_tree_view.setColumnWidth(5, 40)
+
+        self.display_report()
+        self.display_period_report()
+
+        # The graph is made only when the "Attendance Chart" is first shown.
+        self.options_tabWidget.currentChanged.connect(self.show_attendance_chart)
+        self.reports_tabWidget.currentChanged.connect(self.show_attendance_chart)
+        self.show_attendance_chart()
+
+    def show_attendance_chart(self):
+        """Makes the "Attendance Chart" graph, if the chart is shown for the first time."""
+        if self.graph_widget is not None:
+            return
+
+        if self.options_tabWidget.currentWidget() is self.reports_tab and \
+                self.reports_tabWidget.currentWidget() is self.attendance_chart_tab:
+            with time_task("Attendance chart"):
+                self.create_graph_widget()
+                self.display_graph()
+
+    def create_graph_widget(self):
+        """Makes the "Attendance Chart" graph inside its frame on Reports screen."""
+        from pyqtgraph import PlotWidget
+
+        self.graph_widget = PlotWidget(self.graph_frame)
+
+        graph_layout = QtWidgets.QVBoxLayout(self.graph_frame)
+        graph_layout.setContentsMargins(0, 0, 0, 0)
+        graph_layout.addWidget(self.graph_widget)
+
         self.graph_widget.setBackground("w")
         self.graph_widget.setLabel("left", "Attendance Percentage")
         self.graph_widget.setLabel("bottom", "Days")
@@ -703,12 +3642,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.graph_widget.setRange(xRange=(1, 10), yRange=(1, 105))
         self.graph_widget.setTitle("Class Attendance Percentage Over The Past Days", size="12pt")
 
-        raw_date = get_date()[1]
-        self.report_date_date_edit.setDate(QtCore.QDate(raw_date[2], raw_date[1], raw_date[0]))
-        self.get_report_button.clicked.connect(self.display_report)
-        self.display_report()
-        self.display_graph()
-        self.populate_individual_student_report_list()
+        # The attendance percentages are plotted by a single item, which is kept and changed in place.
+        # Only the days in view are drawn, and when many days are in view, they are drawn as fewer points.
+        self.graph_plot = self.graph_widget.plot(pen="k", symbol="o", symbolPen="b", symbolBrush=0.1)
+        self.graph_plot.setClipToView(True)
+        self.graph_plot.setDownsampling(auto=True, method="peak")
+
+        self.graph_widget.sigXRangeChanged.connect(self.load_graph_window)
 
     def setup_settings_screen(self):
         """Setup all the visual elements on Settings screen."""
@@ -721,6 +3661,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.backup_frequency_combo_box.setCurrentIndex(settings["backup frequency"])
         self.save_settings_button.clicked.connect(self.save_settings)
         self.reset_to_default_button.clicked.connect(self.reset_settings)
+        self.restore_backup_button.clicked.connect(self.restore_backup)
+        self.check_reports_button.clicked.connect(self.check_reports)
 
     def setup_about_screen(self):
         """Setup all the visual elements on About screen."""
@@ -729,46 +3671,22 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def populate_student_list_on_class_screen(self):
         """Populates the list of students on Class screen."""
-        self.students_tree_widget.clear()
-
         student_list = get_student_list()
-        for i in range(len(student_list)):
-            student_name = student_list[i]
-            self.students_tree_widget.addTopLevelItem(
-                QtWidgets.QTreeWidgetItem([str(i + 1), student_name])
-            )
 
+        self.class_list_model.set_rows(student_list)
+        self.update_student_search(student_list)
         self.set_student_count()
 
-    def get_children_of_students_tree_widget(self) -> list:
+    def update_student_search(self, student_list: list):
         """
-        Prepares the list of children present inside the parent element
-        of the students_tree_widget.
-        Here, children refers to the sub-elements of the primary element
-        (parent - the invisible root item) inside the students_tree_widget.
+        Updates the search index with the students of the Class, and searches again for the students being searched.
 
-        :return: List containing children of the parent element.
+        :param student_list: Names of the students, in the order of their roll numbers.
         """
-        parent = self.students_tree_widget.invisibleRootItem()
-        child_count = parent.childCount()
-
-        children = list()
-        for i in range(child_count):
-            children.append(parent.child(i))
-
-        return children
-
-    def search_student_in_student_list(self):
-        """Searches and displays the required student in student list on Class screen."""
-        children = self.get_children_of_students_tree_widget()
+        self.student_search_index.set_names(student_list)
 
-        for child in children:
-            if self.search_student_class_line_edit.text().lower().strip() == child.text(0).lower() \
-                    or self.search_student_class_line_edit.text().lower().strip() in child.text(1).lower():
-                child.setHidden(False)
-
-            else:
-                child.setHidden(True)
+        self.class_search.search()
+        self.attendance_search.search()
 
     def set_student_count(self):
         """Sets the number of students on Class screen."""
@@ -784,7 +3702,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         :return: Total number of students in Class.
         """
-        return self.students_tree_widget.topLevelItemCount()
+        return self.class_list_model.rowCount()
 
     def create_class(self):
         """Displays the dialog to create a new empty class."""
@@ -808,47 +3726,39 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def edit_class(self):
         """Displays the dialog to add, remove and rename students in the class."""
-        edit_class_dialog = EditClassDialog()
+        edit_class_dialog = get_dialog(EditClassDialog)
         edit_class_dialog.exec()
+        action = edit_class_dialog.get_action()
 
-        if edit_class_dialog.get_action() == "add":
-            self.populate_student_list_on_class_screen()
-            self.populate_student_list_on_attendance_screen()
+        if action in ("add", "remove", "rename"):
+            # The data read in the background for the screens not shown yet is out of date now.
+            self.screen_data_thread.discard()
 
-        elif edit_class_dialog.get_action() == "remove":
             self.populate_student_list_on_class_screen()
-            self.populate_student_list_on_attendance_screen()
-
-            self.populate_individual_student_report_list()
 
-        elif edit_class_dialog.get_action() == "rename":
-            self.populate_student_list_on_class_screen()
-            self.populate_student_list_on_attendance_screen()
+            if self.is_screen_set_up(self.attendance_tab):
+                self.populate_student_list_on_attendance_screen()
 
-            self.display_report()
-            self.populate_individual_student_report_list()
+        if self.is_screen_set_up(self.reports_tab):
+            if action == "remove":
+                self.populate_individual_student_report_list()
 
-    @staticmethod
-    def backup_data():
-        """Exports attendance data to the required files and updates the backup date."""
-        settings = get_settings()
-        if strftime("%Y-%m-%d") == str(settings["backup date"]):
-            export_data()
-            use_information_database()
+            elif action == "rename":
+                self.display_report()
+                self.display_period_report()
 
-            update_backup_date_query = "UPDATE paper_settings_table " \
-                                       "SET backup_date = date_add(" \
-                                       f"curdate(), interval {settings['backup frequency']} day" \
-                                       ")"
-            data_cursor.execute(update_backup_date_query)
+    def export_data_in_chosen_format(self):
+        """Exports attendance data in the format chosen next to the "Export Data" button."""
+        export_data(EXPORT_FORMATS[self.export_format_combo_box.currentIndex()])
 
     def populate_student_list_on_attendance_screen(self):
-        """Populates and displays the list of students on the Attendance screen."""
+        """
+        Populates and displays the list of students on the Attendance screen.
+        The students who are listed already keep their marks.
+        """
         student_list = get_student_list()
         settings = get_settings()
 
-        self.mark_attendance_tree_widget.clear()
-
         # If the student list is not empty, enable the "Save" and "Clear" buttons.
         if student_list:
             self.save_button.setEnabled(True)
@@ -860,155 +3770,72 @@ class MainWindow(QtWidgets.QMainWindow):
             self.clear_button.setEnabled(False)
 
         # If the user has enabled the setting to "show all students marked as present", then
-        # populate the student list on attendance screen with all checkboxes checked.
-        if settings["check present"] == "Y":
-            for i in range(len(student_list)):
-                student_name = student_list[i]
-                item = QtWidgets.QTreeWidgetItem(
-                    self.mark_attendance_tree_widget,
-                    ["", str(i + 1), student_name]
-                )
-                # Check all the checkboxes.
-                item.setCheckState(0, QtCore.Qt.CheckState.Checked)
-                self.mark_attendance_tree_widget.addTopLevelItem(item)
-
-        # If the setting is disabled, then populate the student list with all checkboxes unchecked.
-        else:
-            for i in range(len(student_list)):
-                student_name = student_list[i]
-                item = QtWidgets.QTreeWidgetItem(self.mark_attendance_tree_widget, ["", str(i + 1), student_name])
-                # Uncheck all the checkboxes.
-                item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
-                self.mark_attendance_tree_widget.addTopLevelItem(item)
-
-    def get_children_of_attendance_tree_widget(self) -> list:
-        """
-        Prepares the list of children present inside the parent element
-        of the mark_attendance_tree_widget.
-        Here, children refers to the sub-elements of the primary element
-        (parent - the invisible root item) inside the mark_attendance_tree_widget.
-
-        :return: List containing children of the parent element.
-        """
-        parent = self.mark_attendance_tree_widget.invisibleRootItem()
-        child_count = parent.childCount()
-
-        children = list()
-
-        for i in range(child_count):
-            children.append(parent.child(i))
-
-        return children
-
-    def search_student_in_attendance_list(self):
-        """Searches and displays the required student in attendance list on Attendance screen."""
-        children = self.get_children_of_attendance_tree_widget()
-
-        for child in children:
-            if self.search_student_attendance_line_edit.text().lower().strip() == child.text(1).lower() \
-                    or self.search_student_attendance_line_edit.text().lower().strip() in child.text(2).lower():
-                child.setHidden(False)
-
-            else:
-                child.setHidden(True)
+        # new students are listed with their checkboxes checked, else unchecked.
+        self.attendance_list_model.set_students(student_list, settings["check present"] == "Y")
+        self.update_student_search(student_list)
 
     def clear_student_list_attendance_screen(self):
         """Clears the recorded attendance to start over."""
-        student_list = get_student_list()
-        self.mark_attendance_tree_widget.clear()
-
-        for i in range(len(student_list)):
-            student_name = student_list[i]
-            item = QtWidgets.QTreeWidgetItem(self.mark_attendance_tree_widget, ["", str(i + 1), student_name])
-            item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
-            self.mark_attendance_tree_widget.addTopLevelItem(item)
+        self.attendance_list_model.mark_all(False)
 
     def save_attendance(self):
         """Saves the recorded attendance data for the day."""
-        save_attendance_confirmation_dialog = SaveAttendanceConfirmationDialog()
+        save_attendance_confirmation_dialog = get_dialog(SaveAttendanceConfirmationDialog)
         save_attendance_confirmation_dialog.exec()
         action = save_attendance_confirmation_dialog.get_action()
 
         if action == "save":
-            date = get_date()[0]
-            # Try creating the database "paper_attendance_database". This will be done
+            # Create the databases and tables for the records and the reports. This will be done
             # only when the attendance is recorded for the first time.
-            try:
-                create_attendance_database()
+            prepare_record_tables()
 
-            # If an error occurs, it means that the database already exists and this is
-            # not the first attendance record.
-            # Do nothing.
-            except server.DatabaseError:
-                pass
+            attendance_record = self.attendance_list_model.get_attendance_record()
 
-            # Try creating a table inside "paper_attendance_database" with
-            # today's date in DD_MM_YYYY format as name.
+            # Write the attendance record and the reports in a single transaction, so that the
+            # day is either saved completely or not at all.
+            # The tables are created beforehand, as creating a table ends the transaction.
+            data_storage.start_transaction()
             try:
-                create_attendance_table(date)
-
-            # If an error occurs, it means that the table already exists and the user
-            # is editing today's attendance data.
-            except server.ProgrammingError:
-                pass
+                record_attendance(self.today, attendance_record)
+                self.write_attendance_report(attendance_record)
 
-            parent = self.mark_attendance_tree_widget.invisibleRootItem()
-            children = parent.childCount()
+            # If an error occurs, undo everything written for the day and let the error propagate.
+            except DatabaseError:
+                data_storage.rollback()
+                raise
 
-            attendance_record = dict()
+            data_storage.commit()
 
-            for i in range(children):
-                current_child = parent.child(i)
+            # The data read in the background for the screens not shown yet is out of date now.
+            self.screen_data_thread.discard()
 
-                if current_child.checkState(0) == QtCore.Qt.CheckState.Checked:
-                    attendance_record[current_child.text(2)] = "P"
+            if self.is_screen_set_up(self.reports_tab):
+                self.display_report()
+                self.display_period_report()
+                self.update_graph(self.today)
 
-                else:
-                    attendance_record[current_child.text(2)] = "A"
-
-            for student in attendance_record:
-                use_attendance_database()
-
-                record_attendance_query = f"INSERT INTO {self.today} " \
-                                          f"VALUES ('{student}', '{attendance_record[student]}')"
-                data_cursor.execute(record_attendance_query)
-
-            self.write_attendance_report(attendance_record)
             self.attendance_stackedWidget.setCurrentIndex(1)
 
     def show_edit_attendance_data_dialog(self):
         """Displays the dialog for editing attendance data."""
-        edit_attendance_data_dialog = EditAttendanceDataDialog()
+        edit_attendance_data_dialog = get_dialog(EditAttendanceDataDialog)
         edit_attendance_data_dialog.exec()
         action = edit_attendance_data_dialog.get_action()
 
         if action == "edit attendance":
-            self.display_report()
-            self.display_graph()
-            self.populate_individual_student_report_list()
+            # The data read in the background for the screens not shown yet is out of date now.
+            self.screen_data_thread.discard()
+
+            if self.is_screen_set_up(self.reports_tab):
+                self.display_report()
+                self.display_period_report()
+                self.update_graph(edit_attendance_data_dialog.get_edited_date())
 
     def write_attendance_report(self, attendance_record):
         """Writes all attendance reports to the database."""
-        # Try to set "paper_reports_database" as the current working database.
-        try:
-            use_reports_database()
-
-        # If an error occurs, it means that the database does not exist.
-        # So create the database. Inside the database, create the
-        # "paper_student_report_table" table.
-        # This will be done only when the attendance is recorded for
-        # the first time.
-        except server.ProgrammingError:
-            create_reports_database()
-            use_reports_database()
-
-            create_student_report_table()
-
         write_student_report(attendance_record)
         write_daily_report(self.today)
-
-        self.display_report()
-        self.display_graph()
+        write_period_reports(self.today, attendance_record)
 
     def display_report(self):
         """
@@ -1018,197 +3845,210 @@ class MainWindow(QtWidgets.QMainWindow):
         date = self.report_date_date_edit.text().split("-")
         date = "_".join(str(int(i)) for i in date)
 
-        # Try to get report data for a particular date.
-        # If no error occurs, it means that the data exists.
-        # So populate the list of present and absent students and show statistical data.
-        try:
-            use_reports_database()
-            get_report_query = "SELECT date, present, absent, attendance_percentage FROM paper_daily_report_table " \
-                               f"WHERE date = '{date}'"
-            data_cursor.execute(get_report_query)
+        statistical_report_data = self.read_screen_data(("daily report", date), get_daily_report, date)
 
-            statistical_report_data = data_cursor.fetchall()
+        # If the report exists, populate the list of present and absent students and show statistical data.
+        if statistical_report_data is not None:
             self.student_count_reports_label.setText(
-                str(statistical_report_data[0][1] + statistical_report_data[0][2])
+                str(statistical_report_data[0] + statistical_report_data[1])
             )
-            self.present_count_label.setText(str(statistical_report_data[0][1]))
-            self.absent_count_label.setText(str(statistical_report_data[0][2]))
-            self.attendance_percentage_label.setText(str(statistical_report_data[0][3]) + "%")
+            self.present_count_label.setText(str(statistical_report_data[0]))
+            self.absent_count_label.setText(str(statistical_report_data[1]))
+            self.attendance_percentage_label.setText(str(statistical_report_data[2]) + "%")
 
-            self.populate_present_report_list(date)
-            self.populate_absent_report_list(date)
+            present, absent = self.read_screen_data(("attendance record", date), get_attendance_record, date)
+            self.populate_present_report_list(present)
+            self.populate_absent_report_list(absent)
 
-        # If an error occurs, it means that the data for the corresponding date does not exist.
+        # If not, it means that the data for the corresponding date does not exist.
         # So set up the "Reports" screen to show that no data was found.
-        except server.ProgrammingError or IndexError:
+        else:
             self.student_count_reports_label.setText("-")
             self.present_count_label.setText("-")
             self.absent_count_label.setText("-")
             self.attendance_percentage_label.setText("-")
 
-            self.present_tree_widget.clear()
-            self.absent_tree_widget.clear()
-
-            self.present_tree_widget.setColumnCount(1)
-            self.absent_tree_widget.setColumnCount(1)
-
-            self.present_tree_widget.setHeaderLabel("")
-            self.absent_tree_widget.setHeaderLabel("")
-
-            self.present_tree_widget.addTopLevelItem(QtWidgets.QTreeWidgetItem(["No data found!"]))
-            self.absent_tree_widget.addTopLevelItem(QtWidgets.QTreeWidgetItem(["No data found!"]))
+            self.present_report_model.show_message("No data found!")
+            self.absent_report_model.show_message("No data found!")
 
         # Populate the individual student report list as this data is displayed
         # irrespective of any date.
         self.populate_individual_student_report_list()
 
-    def populate_present_report_list(self, date: str):
+    def display_period_report(self):
         """
-        Populates and displays the list of students present on the provided date.
-
-        :param date: Date for querying the list of present students.
+        Gets the report of the week, month or term of the selected date, as chosen in the period selector,
+        and displays it on the "Period Report".
         """
-        self.present_tree_widget.clear()
+        period = REPORT_PERIODS[self.period_combo_box.currentIndex()]
+        selected_date = self.period_date_date_edit.date()
+        period_start = get_period_start(period, datetime.date(selected_date.year(), selected_date.month(),
+                                                              selected_date.day()))
+        period_end = get_period_end(period, period_start)
 
-        self.present_tree_widget.setHeaderLabels(["No.", "Name", "Roll"])
-        self.present_tree_widget.setColumnWidth(0, 40)
-        self.present_tree_widget.setColumnWidth(1, 150)
-        self.present_tree_widget.setColumnWidth(2, 60)
+        self.period_range_label.setText(f"{period_start:%d-%m-%Y} to {period_end:%d-%m-%Y}")
 
-        student_list = get_student_list(date)
+        period_report_data = get_period_report(period, str(period_start))
 
-        use_attendance_database()
+        # If the report exists, show the attendance percentage of the class and the report of every student.
+        if period_report_data is not None:
+            days, student_days, present_days = period_report_data
 
-        get_present_students_query = f"SELECT name FROM {date} WHERE state = 'P'"
-        data_cursor.execute(get_present_students_query)
+            self.period_day_count_label.setText(str(days))
+            self.period_attendance_percentage_label.setText(str(round((present_days / student_days) * 100, 1)) + "%")
 
-        data = data_cursor.fetchall()
-        present = [student[0] for student in data]
+            student_period_report = get_student_period_report(period, str(period_start))
+            self.period_report_model.set_report(student_period_report, get_settings()["minimum attendance"])
 
-        for i in range(len(present)):
-            student_name = present[i]
-            roll_number = str(student_list.index(student_name) + 1)
+        # If not, it means that no attendance was recorded within the period.
+        else:
+            self.period_day_count_label.setText("-")
+            self.period_attendance_percentage_label.setText("-")
 
-            self.present_tree_widget.addTopLevelItem(QtWidgets.QTreeWidgetItem([str(i + 1),
-                                                                                student_name, roll_number]))
+            self.period_report_model.show_message("No data found!")
 
-    def populate_absent_report_list(self, date: str):
+    def populate_present_report_list(self, present: list):
         """
-        Populates and displays the list of students absent on the provided date.
+        Populates and displays the list of students present on a date.
 
-        :param date: Date for querying the list of absent students.
+        :param present: List of (name, roll number) of the present students.
         """
-        self.absent_tree_widget.clear()
+        self.present_report_model.set_rows(present)
 
-        self.absent_tree_widget.setHeaderLabels(["No.", "Name", "Roll"])
-        self.absent_tree_widget.setColumnWidth(0, 40)
-        self.absent_tree_widget.setColumnWidth(1, 150)
-        self.absent_tree_widget.setColumnWidth(2, 60)
+        self.present_tree_view.setColumnWidth(0, 40)
+        self.present_tree_view.setColumnWidth(1, 150)
+        self.present_tree_view.setColumnWidth(2, 60)
 
-        student_list = get_student_list(date)
+    def populate_absent_report_list(self, absent: list):
+        """
+        Populates and displays the list of students absent on a date.
+
+        :param absent: List of (name, roll number) of the absent students.
+        """
+        self.absent_report_model.set_rows(absent)
 
-        use_attendance_database()
+        self.absent_tree_view.setColumnWidth(0, 40)
+        self.absent_tree_view.setColumnWidth(1, 150)
+        self.absent_tree_view.setColumnWidth(2, 60)
 
-        get_absent_students_query = f"SELECT name FROM {date} WHERE state = 'A'"
-        data_cursor.execute(get_absent_students_query)
+    def plot_class_attendance_graph(self):
+        """Plots the attendance graph from the attendance percentages of the days read."""
+        self.graph_plot.setData(self.graph_x, self.graph_y)
 
-        data = data_cursor.fetchall()
-        absent = [student[0] for student in data]
+    def get_graph_day(self, date: str) -> int:
+        """
+        Finds the day of a date on the "Attendance Chart". The first day with a report is day 1.
 
-        for i in range(len(absent)):
-            student_name = absent[i]
-            roll_number = str(student_list.index(student_name) + 1)
+        :param date: The date in 'YYYY-MM-DD' format.
+        :return: The day.
+        """
+        return (datetime.date.fromisoformat(date) - self.graph_first_date).days + 1
 
-            self.absent_tree_widget.addTopLevelItem(QtWidgets.QTreeWidgetItem([str(i + 1),
-                                                                               student_name, roll_number]))
+    def get_graph_date(self, day: int) -> str:
+        """
+        Finds the date of a day on the "Attendance Chart".
 
-    def plot_class_attendance_graph(self, days: list, attendance_percentage: list):
-        """Plots the attendance graph."""
-        self.graph_widget.plot(days, attendance_percentage, pen="k", symbol="o", symbolPen="b", symbolBrush=0.1)
+        :param day: The day.
+        :return: The date in 'YYYY-MM-DD' format.
+        """
+        return str(self.graph_first_date + datetime.timedelta(days=day - 1))
 
     def display_graph(self):
-        """Gets the required data and displays the "Attendance Chart"."""
-        # Try to get attendance percentage data.
-        try:
-            use_reports_database()
+        """Gets the required data and displays the "Attendance Chart", showing the last days."""
+        # If the graph is not made yet, there is nothing to display.
+        # The data is read when the chart is first shown.
+        if self.graph_widget is None:
+            return
 
-            get_attendance_percentage_data_query = "SELECT attendance_percentage FROM paper_daily_report_table"
-            data_cursor.execute(get_attendance_percentage_data_query)
+        first_date, last_date = get_report_date_range()
 
-            data = data_cursor.fetchall()
+        self.graph_first_date = None
+        self.graph_window = None
 
-        # If an error occurs, it means that no attendance has been recorded till now.
-        # So return empty list.
-        except server.ProgrammingError:
-            data = list()
+        # If there are no reports, there is nothing to plot.
+        if first_date is None:
+            self.graph_plot.setData([], [])
+            return
 
-        days_data = list()
-        attendance_percentage_data = list()
+        self.graph_first_date = datetime.date.fromisoformat(first_date)
+        last_day = self.get_graph_day(last_date)
 
-        for i in range(len(data)):
-            days_data.append(i + 1)
-            attendance_percentage_data.append(float(data[i][0]))
+        self.graph_widget.setLimits(xMax=max(365, last_day + 1))
+        self.graph_widget.setXRange(max(1, last_day - 9), max(10, last_day))
+        self.load_graph_window()
 
-        self.graph_widget.clear()
-        self.plot_class_attendance_graph(days_data, attendance_percentage_data)
+    def load_graph_window(self):
+        """
+        Reads the attendance percentages of the days in view on the "Attendance Chart", and of as many days
+        on either side, unless they are read already, and plots them.
+        """
+        if self.graph_first_date is None:
+            return
 
-    def populate_individual_student_report_list(self):
-        """Populates and displays the list of students with attendance report of each student."""
-        self.student_report_tree_widget.clear()
+        import numpy
 
-        self.student_report_tree_widget.setHeaderLabels(["Roll", "Name", "Days Present",
-                                                         "Total Days", "Percentage", "Remark"])
+        view_start, view_end = self.graph_widget.viewRange()[0]
+        if self.graph_window is not None and self.graph_window[0] <= view_start and view_end <= self.graph_window[1]:
+            return
 
-        self.student_report_tree_widget.setColumnWidth(0, 40)
-        self.student_report_tree_widget.setColumnWidth(1, 150)
-        self.student_report_tree_widget.setColumnWidth(2, 100)
-        self.student_report_tree_widget.setColumnWidth(3, 100)
-        self.student_report_tree_widget.setColumnWidth(4, 100)
-        self.student_report_tree_widget.setColumnWidth(5, 40)
+        view_width = view_end - view_start
+        first_day = math.floor(view_start - view_width)
+        last_day = math.ceil(view_end + view_width)
 
-        # Try to populate the individual student report list.
-        try:
-            use_reports_database()
+        series = get_attendance_percentage_series(self.get_graph_date(first_day), self.get_graph_date(last_day))
 
-            get_student_report_query = "SELECT * FROM paper_student_report_table"
-            data_cursor.execute(get_student_report_query)
+        self.graph_window = (first_day, last_day)
+        self.graph_x = numpy.array([self.get_graph_day(date) for date, percentage in series], dtype=float)
+        self.graph_y = numpy.array([percentage for date, percentage in series], dtype=float)
 
-            student_report = data_cursor.fetchall()
-            settings = get_settings()
+        self.plot_class_attendance_graph()
 
-            for i in range(len(student_report)):
-                student_name = student_report[i][0]
-                total_days = student_report[i][1]
-                days_present = student_report[i][2]
+    def update_graph(self, date: str):
+        """
+        Updates the point of a single day on the "Attendance Chart", after its attendance is recorded or edited.
 
-                percentage = round((days_present / total_days) * 100, 2)
+        :param date: Date whose attendance changed, in 'D_M_YYYY' format.
+        """
+        # If the graph is not made yet, the day is plotted when the chart is first shown.
+        if self.graph_widget is None:
+            return
 
-                item = QtWidgets.QTreeWidgetItem(self.student_report_tree_widget, [str(i + 1), student_name,
-                                                                                   str(days_present),
-                                                                                   str(total_days),
-                                                                                   str(percentage) + "%"])
+        import numpy
 
-                if 50 < percentage <= settings["minimum attendance"]:
-                    remark_icon = QtGui.QIcon("src/icons/icons8-error-96.png")
-                    item.setIcon(5, remark_icon)
+        statistical_report_data = get_daily_report(date)
+        if statistical_report_data is None:
+            return
 
-                elif percentage > 90:
-                    remark_icon = QtGui.QIcon("src/icons/icons8-prize-96.png")
-                    item.setIcon(5, remark_icon)
+        report_date = get_report_date(date)
 
-                elif percentage <= 50:
-                    remark_icon = QtGui.QIcon("src/icons/icons8-high-priority-96.png")
-                    item.setIcon(5, remark_icon)
+        # If this is the first report, or it comes before the first day, the days are counted again.
+        if self.graph_first_date is None or self.get_graph_day(report_date) < 1:
+            self.display_graph()
+            return
 
-                else:
-                    pass
+        day = self.get_graph_day(report_date)
+        self.graph_widget.setLimits(xMax=max(365, day + 1))
 
-                self.student_report_tree_widget.addTopLevelItem(item)
+        # If the day is outside the window of days read, it is read when it comes into view.
+        if not self.graph_window[0] <= day <= self.graph_window[1]:
+            return
 
-        # If an error occurs, it means that no attendance has been recorded till now.
-        # Do nothing.
-        except server.ProgrammingError:
-            pass
+        position = int(numpy.searchsorted(self.graph_x, day))
+
+        if position < len(self.graph_x) and self.graph_x[position] == day:
+            self.graph_y[position] = float(statistical_report_data[2])
+        else:
+            self.graph_x = numpy.insert(self.graph_x, position, day)
+            self.graph_y = numpy.insert(self.graph_y, position, float(statistical_report_data[2]))
+
+        self.plot_class_attendance_graph()
+
+    def populate_individual_student_report_list(self):
+        """Populates and displays the list of students with attendance report of each student."""
+        student_report = self.read_screen_data(("student report",), get_student_report)
+        settings = get_settings()
+
+        self.student_report_model.set_report(student_report, settings["minimum attendance"])
 
     def save_new_pin(self):
         """Updates PIN to the new PIN provided by the user."""
@@ -1227,14 +4067,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 good_new_pin_illustration = QtGui.QPixmap("src/drawables/icons8-verified-account-100.png")
                 self.new_pin_check_illustration.setPixmap(good_new_pin_illustration)
 
-                use_information_database()
-
-                save_new_pin_query = f"UPDATE paper_data_table SET pin = '{new_pin}'"
-                data_cursor.execute(save_new_pin_query)
+                set_pin(new_pin)
 
-                get_pin()
-
-                pin_saved_message_dialog = PINSavedMessageDialog()
+                pin_saved_message_dialog = get_dialog(PINSavedMessageDialog)
                 pin_saved_message_dialog.exec()
 
         else:
@@ -1245,24 +4080,18 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def save_setting_check_present(self):
         """Manages the "Show all students marked as present" setting."""
-        use_information_database()
         if self.check_present_check_box.checkState() == QtCore.Qt.CheckState.Checked:
-            update_settings_check_present_query = "UPDATE paper_settings_table SET check_present = 'Y'"
-            data_cursor.execute(update_settings_check_present_query)
+            save_setting("check present", "Y")
 
         elif self.check_present_check_box.checkState() == QtCore.Qt.CheckState.Unchecked:
-            update_settings_check_present_query = "UPDATE paper_settings_table SET check_present = 'N'"
-            data_cursor.execute(update_settings_check_present_query)
+            save_setting("check present", "N")
 
     def save_setting_minimum_attendance(self):
         """Manages the "Minimum attendance percentage" setting."""
         minimum_attendance_percentage = self.minimum_attendance_spin_box.text()
         minimum_attendance_numerical = minimum_attendance_percentage[0:len(minimum_attendance_percentage) - 1]
 
-        use_information_database()
-        set_minimum_attendance_percentage_query = "UPDATE paper_settings_table " \
-                                                  f"SET minimum_attendance = {minimum_attendance_numerical}"
-        data_cursor.execute(set_minimum_attendance_percentage_query)
+        save_setting("minimum attendance", int(minimum_attendance_numerical))
 
     def save_setting_backup_frequency(self):
         """Manages the "Automatic backup" setting."""
@@ -1270,26 +4099,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
         if selected_backup_frequency == "Daily":
             backup_frequency = 0
-            backup_date_difference = 1
 
         elif selected_backup_frequency == "Weekly":
             backup_frequency = 1
-            backup_date_difference = 7
 
         else:
             backup_frequency = 2
-            backup_date_difference = 30
-
-        use_information_database()
 
-        set_backup_frequency_query = f"UPDATE paper_settings_table SET backup_frequency = {backup_frequency}"
-        data_cursor.execute(set_backup_frequency_query)
-
-        update_backup_frequency_query = "UPDATE paper_settings_table " \
-                                        "SET backup_date = date_add(" \
-                                        f"curdate(), interval {backup_date_difference} day" \
-                                        ")"
-        data_cursor.execute(update_backup_frequency_query)
+        save_setting("backup frequency", backup_frequency)
+        save_setting("backup date", get_date_after(BACKUP_FREQUENCY_DAYS[backup_frequency]))
 
     def save_settings(self):
         """Saves all the chosen settings."""
@@ -1299,7 +4117,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.perform_settings()
 
-        settings_saved_message_dialog = SettingsSavedMessageDialog()
+        settings_saved_message_dialog = get_dialog(SettingsSavedMessageDialog)
         settings_saved_message_dialog.exec()
 
     def reset_settings(self):
@@ -1311,14 +4129,74 @@ class MainWindow(QtWidgets.QMainWindow):
         if action == "reset settings":
             self.check_present_check_box.setCheckState(QtCore.Qt.CheckState.Unchecked)
 
-            use_information_database()
+            restore_default_settings()
 
-            drop_settings_table_query = "DROP TABLE paper_settings_table"
-            data_cursor.execute(drop_settings_table_query)
+            self.perform_settings()
 
-            create_settings_table()
+    def restore_backup(self):
+        """Replaces all the data with a snapshot chosen by the user, after verifying the PIN."""
+        file_path = QtWidgets.QFileDialog.getOpenFileName(self, "Paper - Restore Backup", BACKUP_FOLDER_PATH,
+                                                          "Paper snapshots (*.paper.gz)")[0]
+        if file_path == "":
+            return
 
-            self.perform_settings()
+        verify_identity_dialog = VerifyIdentityDialog()
+        verify_identity_dialog.exec()
+
+        if verify_identity_dialog.is_verified():
+            self.backup_scheduler.stop()
+            self.screen_data_thread.discard()
+
+            # Try to take a snapshot of the current data first, so that the restore can be undone, then restore
+            # the chosen snapshot. The chosen snapshot may be the oldest one, so it is kept from being removed.
+            undo_file_path = None
+            try:
+                undo_file_path = create_snapshot(kept_path=file_path)
+                restore_snapshot(file_path)
+
+            # If an error occurs, put the data back as it was, and tell the user that nothing was restored.
+            except SNAPSHOT_ERRORS:
+                # Try to restore the snapshot of the current data, if it was taken.
+                try:
+                    if undo_file_path is not None:
+                        restore_snapshot(undo_file_path)
+
+                # If an error occurs again, the data may be partly restored. The snapshot of the data taken
+                # before the restore is kept, and the user is told its name, so that it can be restored again.
+                except SNAPSHOT_ERRORS:
+                    undo_failed_error_dialog = get_dialog(UndoFailedErrorDialog)
+                    undo_failed_error_dialog.set_file_path(keep_snapshot(undo_file_path))
+                    undo_failed_error_dialog.exec()
+
+                else:
+                    restore_failed_error_dialog = get_dialog(RestoreFailedErrorDialog)
+                    restore_failed_error_dialog.exec()
+
+            global main_window
+            main_window.destroy()
+
+            main_window = MainWindow()
+
+    def check_reports(self):
+        """
+        Checks the attendance report of every student against the attendance records, and tells the user
+        which reports differ. The reports are repaired only if the user chooses to.
+        """
+        differences = check_student_report()
+        names = get_student_names([student_id for student_id, kept_report, counted_report in differences])
+
+        reports_checked_message_dialog = get_dialog(ReportsCheckedMessageDialog)
+        reports_checked_message_dialog.set_message(sorted(names))
+        reports_checked_message_dialog.exec()
+
+        if reports_checked_message_dialog.get_action() == "repair reports":
+            rebuild_student_report()
+
+            # The data read in the background for the screens not shown yet is out of date now.
+            self.screen_data_thread.discard()
+
+            if self.is_screen_set_up(self.reports_tab):
+                self.populate_individual_student_report_list()
 
     def perform_settings(self):
         """Makes required changes after a setting's value changes."""
@@ -1326,8 +4204,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.minimum_attendance_spin_box.setValue(settings["minimum attendance"])
         self.backup_frequency_combo_box.setCurrentIndex(settings["backup frequency"])
 
-        self.populate_student_list_on_attendance_screen()
-        self.populate_individual_student_report_list()
+        # The students are marked again as the "check present" setting says.
+        if self.is_screen_set_up(self.attendance_tab):
+            self.attendance_list_model.mark_all(settings["check present"] == "Y")
+        if self.is_screen_set_up(self.reports_tab):
+            self.populate_individual_student_report_list()
 
     @staticmethod
     def display_credits():
@@ -1345,7 +4226,7 @@ class MainWindow(QtWidgets.QMainWindow):
 class CreateClassDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/CreateClassDialog_ui.ui", self)
+        load_ui("src/layout/CreateClassDialog_ui.ui", self)
 
         self.create_button.clicked.connect(self.create)
         self.cancel_button.clicked.connect(self.close)
@@ -1364,7 +4245,7 @@ class CreateClassDialog(QtWidgets.QDialog):
 class RenameClassDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/RenameClassDialog_ui.ui", self)
+        load_ui("src/layout/RenameClassDialog_ui.ui", self)
 
         self.rename_button.clicked.connect(self.rename)
         self.cancel_button.clicked.connect(self.close)
@@ -1382,7 +4263,7 @@ class RenameClassDialog(QtWidgets.QDialog):
 class DeleteClassConfirmationDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/DeleteClassConfirmationDialog_ui.ui", self)
+        load_ui("src/layout/DeleteClassConfirmationDialog_ui.ui", self)
 
         self.yes_button.clicked.connect(self.delete)
         self.no_button.clicked.connect(self.close)
@@ -1391,31 +4272,35 @@ class DeleteClassConfirmationDialog(QtWidgets.QDialog):
         """Deletes all the databases, hence deleting the Class."""
         self.close()
 
+        # The main window is made again, so its backup and the reading of its screen data must not be left running.
+        global main_window
+        main_window.backup_scheduler.stop()
+        main_window.screen_data_thread.discard()
+
         verify_identity_dialog = VerifyIdentityDialog()
         verify_identity_dialog.exec()
         pin_valid = verify_identity_dialog.is_verified()
 
         if pin_valid:
-            try:
-                use_attendance_database()
+            if data_storage.has_database("paper_attendance_database"):
                 export_data()
-            except server.ProgrammingError:
-                pass
 
-            delete_information_database_query = "DROP DATABASE paper_information_database"
-            data_cursor.execute(delete_information_database_query)
+            # Keep a snapshot of the Class, so that it can be restored later.
+            create_snapshot()
 
-            try:
-                delete_attendance_database_query = "DROP DATABASE paper_attendance_database"
-                data_cursor.execute(delete_attendance_database_query)
+            data_storage.drop_database("paper_information_database")
 
-                delete_reports_database_query = "DROP DATABASE paper_reports_database"
-                data_cursor.execute(delete_reports_database_query)
+            try:
+                data_storage.drop_database("paper_attendance_database")
+                data_storage.drop_database("paper_reports_database")
 
-            except server.DatabaseError:
+            except DatabaseError:
                 pass
 
-        global main_window
+            clear_configuration_cache()
+            forget_record_tables()
+            student_roster.clear()
+
         main_window.destroy()
 
         create_information_database()
@@ -1427,7 +4312,7 @@ class DeleteClassConfirmationDialog(QtWidgets.QDialog):
 class VerifyIdentityDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/VerifyIdentityDialog_ui.ui", self)
+        load_ui("src/layout/VerifyIdentityDialog_ui.ui", self)
 
         self._verified = False
 
@@ -1456,57 +4341,448 @@ class VerifyIdentityDialog(QtWidgets.QDialog):
             self.pinCheck_label.setText("Incorrect PIN")
 
 
+# Formats in which the attendance data can be exported:
+#   "daily files": a CSV file for every date, with the state of every student on that date.
+#   "single table": one CSV file with a row for every student and a column for every date.
+#   "compressed table": the single table, compressed with gzip.
+EXPORT_FORMATS = ("daily files", "single table", "compressed table")
+
+
+class ExportDataThread(QtCore.QThread):
+    """
+    Writes the attendance records to CSV files away from the GUI thread, in one of EXPORT_FORMATS.
+    As daily files, only the dates whose records changed since they were last exported are written,
+    as told by "paper_export_manifest_table". The records are read in batches and written as they arrive,
+    so they are never all held in memory.
+    """
+
+    file_changed = QtCore.pyqtSignal(str)
+    progress_changed = QtCore.pyqtSignal(int)
+
+    BATCH_SIZE = 500
+
+    def __init__(self, folder_path: str, export_format: str = "daily files"):
+        super().__init__()
+
+        self.folder_path = folder_path
+        self.export_format = export_format
+        self._cancelled = False
+
+        self._record_count = 0
+        self._written_count = 0
+
+    def is_cancelled(self) -> bool:
+        """
+        Tells whether the export was stopped before all the records were written.
+
+        :return: True if the export was cancelled, else False.
+        """
+        return self._cancelled
+
+    def get_file_path(self, date: str) -> str:
+        """
+        Makes the path of the file holding the attendance record of the provided date.
+
+        :param date: Date of the attendance record.
+        :return: Path of the file.
+        """
+        # Each attendance record is dated as "DD_MM_YYYY". To make things presentable, replace
+        # all underscores with hyphens to make it look like a general date (DD-MM-YYYY).
+        file_name = date.replace("_", "-")
+        return os.path.join(self.folder_path, f"Attendance Record {file_name} .csv")
+
+    def run(self):
+        """Exports the records on a connection of its own."""
+        with data_storage.connection() as cursor:
+            if self.export_format == "daily files":
+                self.write_daily_files(cursor)
+            else:
+                self.write_table(cursor, compressed=self.export_format == "compressed table")
+
+        self.progress_changed.emit(100)
+
+    def write_daily_files(self, cursor: DataCursor):
+        """
+        Writes the changed records to CSV files, one file per date.
+
+        :param cursor: Cursor to run the queries on.
+        """
+        # Try to find the dates which need to be exported.
+        try:
+            changed_records = self.get_changed_records(cursor)
+
+        # If an error occurs, it means that no attendance has been recorded till now.
+        # So there is nothing to export.
+        except ProgrammingError:
+            return
+
+        self._record_count = sum(record_count for date, record_count in changed_records)
+
+        note_export_query = data_storage.upsert_query("paper_attendance_database.paper_export_manifest_table",
+                                                      ["date", "record_count"], "date")
+
+        for date, record_count in changed_records:
+            if not self.write_record(cursor, date):
+                self._cancelled = True
+                return
+
+            cursor.execute(note_export_query, (date, record_count))
+
+    def get_changed_records(self, cursor: DataCursor) -> list:
+        """
+        Finds the dates whose records were never exported, or changed since they were last exported.
+        A record has changed if it was marked by mark_record_changed(), if its number of rows differs from
+        the number exported, or if its file is missing.
+
+        :param cursor: Cursor to run the query on.
+        :return: List of (date, number of rows) of the changed records.
+        """
+        get_record_counts_query = "SELECT records.date, count(*), manifest.record_count " \
+                                  "FROM paper_attendance_database.paper_attendance_table AS records " \
+                                  "LEFT JOIN paper_attendance_database.paper_export_manifest_table AS manifest " \
+                                  "ON manifest.date = records.date " \
+                                  "GROUP BY records.date, manifest.record_count"
+        cursor.execute(get_record_counts_query)
+
+        return [
+            (date, record_count) for date, record_count, exported_count in cursor.fetchall()
+            if record_count != exported_count or not os.path.exists(self.get_file_path(date))
+        ]
+
+    def write_record(self, cursor: DataCursor, date: str) -> bool:
+        """
+        Writes the attendance record of the provided date as it is read from the database.
+
+        :param cursor: Cursor to run the query on.
+        :param date: Date of the attendance record.
+        :return: False if the export was cancelled while writing, else True.
+        """
+        from csv import writer
+
+        file_path = self.get_file_path(date)
+        self.file_changed.emit(f"Attendance Record {date.replace('_', '-')}")
+
+        get_record_query = "SELECT student.name, record.state " \
+                           "FROM paper_attendance_database.paper_attendance_table AS record " \
+                           "JOIN paper_information_database.paper_student_list_table AS student " \
+                           "ON student.id = record.student_id " \
+                           "WHERE record.date = %s ORDER BY student.name"
+        cursor.stream(get_record_query, (date,))
+
+        with open(file_path, "w", newline="") as data_file:
+            data_writer = writer(data_file)
+            data_writer.writerow(["Name", "State"])
+
+            rows = cursor.fetchmany(self.BATCH_SIZE)
+            while rows and not self.isInterruptionRequested():
+                data_writer.writerows(rows)
+
+                self._written_count += len(rows)
+                self.progress_changed.emit(self._written_count * 100 // self._record_count)
+
+                rows = cursor.fetchmany(self.BATCH_SIZE)
+
+        # If the user cancelled the export, remove the file which is half written.
+        if rows:
+            os.remove(file_path)
+            return False
+
+        return True
+
+    def write_table(self, cursor: DataCursor, compressed: bool):
+        """
+        Writes all the records to a single CSV file, with a row for every student and a column for every date,
+        in one pass over the records ordered by student.
+
+        :param cursor: Cursor to run the queries on.
+        :param compressed: If True, the file is compressed with gzip.
+        """
+        import gzip
+        from csv import writer
+
+        # Try to get the dates, and the number of records of each date, for the columns and the progress.
+        try:
+            get_record_counts_query = "SELECT date, count(*) FROM paper_attendance_database.paper_attendance_table " \
+                                      "GROUP BY date"
+            cursor.execute(get_record_counts_query)
+            record_counts = cursor.fetchall()
+
+        # If an error occurs, it means that no attendance has been recorded till now.
+        # So there is nothing to export.
+        except ProgrammingError:
+            return
+
+        # Dates are stored as "DD_MM_YYYY", so they are put in order by their year, month and day.
+        dates = sorted((date for date, record_count in record_counts),
+                       key=lambda date: [int(i) for i in reversed(date.split("_"))])
+        columns = {date: column for column, date in enumerate(dates)}
+
+        self._record_count = sum(record_count for date, record_count in record_counts)
+
+        if compressed:
+            file_name = "Attendance Table.csv.gz"
+            file_path = os.path.join(self.folder_path, file_name)
+            data_file = gzip.open(file_path, "wt", newline="")
+        else:
+            file_name = "Attendance Table.csv"
+            file_path = os.path.join(self.folder_path, file_name)
+            data_file = open(file_path, "w", newline="")
+
+        self.file_changed.emit(file_name)
+
+        get_records_query = "SELECT student.id, student.name, record.date, record.state " \
+                            "FROM paper_attendance_database.paper_attendance_table AS record " \
+                            "JOIN paper_information_database.paper_student_list_table AS student " \
+                            "ON student.id = record.student_id " \
+                            "ORDER BY student.name, student.id"
+        cursor.stream(get_records_query)
+
+        with data_file:
+            data_writer = writer(data_file)
+            data_writer.writerow(["Name"] + [date.replace("_", "-") for date in dates])
+
+            current_student_id = None
+            current_name = None
+            states = list()
+
+            rows = cursor.fetchmany(self.BATCH_SIZE)
+            while rows and not self.isInterruptionRequested():
+                for student_id, name, date, state in rows:
+                    # The records of a student come together, so the row of the previous student is complete.
+                    # Students are told apart by "id", as a removed student may have had the same name.
+                    if student_id != current_student_id:
+                        if current_student_id is not None:
+                            data_writer.writerow([current_name] + states)
+
+                        current_student_id = student_id
+                        current_name = name
+                        states = [""] * len(dates)
+
+                    states[columns[date]] = state
+
+                self._written_count += len(rows)
+                self.progress_changed.emit(self._written_count * 100 // self._record_count)
+
+                rows = cursor.fetchmany(self.BATCH_SIZE)
+
+            if current_student_id is not None:
+                data_writer.writerow([current_name] + states)
+
+        # If the user cancelled the export, remove the file which is half written.
+        if rows:
+            os.remove(file_path)
+            self._cancelled = True
+
+
 class ExportDataDialog(QtWidgets.QDialog):
-    def __init__(self):
+    def __init__(self, export_format: str = "daily files"):
         super().__init__()
-        uic.loadUi("src/layout/ExportDataDialog_ui.ui", self)
+        load_ui("src/layout/ExportDataDialog_ui.ui", self)
 
         self.show()
         self.close_button.clicked.connect(self.close)
         self.go_to_file_button.clicked.connect(self.go_to_file)
+        self.cancel_button.clicked.connect(self.cancel)
 
-        self.FOLDER_PATH = os.path.expanduser("~") + "\\Documents\\Paper\\Attendance Records"
-        attendance_records = get_past_attendance_records()
-
-        if not os.path.exists(os.path.expanduser("~") + "\\Documents\\Paper\\Attendance Records"):
-            os.makedirs(os.path.expanduser("~") + "\\Documents\\Paper\\Attendance Records")
+        self.FOLDER_PATH = EXPORT_FOLDER_PATH
 
-        use_attendance_database()
-        for record in attendance_records:
-            # Each attendance record is named as "DD_MM_YYYY". To make things presentable, replace
-            # all underscores with hyphens to make it look like a general date (DD-MM-YYYY).
-            file_name = record.replace("_", "-")
-            data_file = open(self.FOLDER_PATH + f"\\Attendance Record {file_name} .csv", "w", newline="")
-            data_writer = writer(data_file)
-
-            self.file_name_label.setText(f"Attendance Record {file_name}")
+        if not os.path.exists(EXPORT_FOLDER_PATH):
+            os.makedirs(EXPORT_FOLDER_PATH)
 
-            get_record_query = f"SELECT * FROM {record}"
-            data_cursor.execute(get_record_query)
+        # Export the records on a separate thread, so that the window keeps responding
+        # however many records there are.
+        self.export_thread = ExportDataThread(self.FOLDER_PATH, export_format)
+        self.export_thread.file_changed.connect(self.file_name_label.setText)
+        self.export_thread.progress_changed.connect(self.progress_bar.setValue)
+        self.export_thread.finished.connect(self.finish)
 
-            attendance_data = data_cursor.fetchall()
+        self.progress_bar.setValue(0)
+        self.export_thread.start()
 
-            data_writer.writerow(["Name", "State"])
-            data_writer.writerows(attendance_data)
+    def cancel(self):
+        """Stops the export after the batch of records being written."""
+        self.cancel_button.setEnabled(False)
+        self.export_thread.requestInterruption()
 
-            data_file.flush()
+    def finish(self):
+        """Shows that the data is exported, or closes the dialog if the export was cancelled."""
+        if self.export_thread.is_cancelled():
+            self.close()
+        else:
+            self.stackedWidget.setCurrentIndex(1)
 
-            self.progress_bar.setValue(
-                ((attendance_records.index(record) + 1) // len(attendance_records)) * 100
-            )
-            application.processEvents()
+    def closeEvent(self, event):
+        """Stops the export, if it is still running, before the dialog closes."""
+        if self.export_thread.isRunning():
+            self.export_thread.requestInterruption()
+            self.export_thread.wait()
 
-        self.stackedWidget.setCurrentIndex(1)
+        super().closeEvent(event)
 
     def go_to_file(self):
         """Opens the file where all attendance data is exported, in File Explorer."""
+        import subprocess
+
         subprocess.Popen(f'explorer "{self.FOLDER_PATH}"')
 
 
+def is_backup_due() -> bool:
+    """
+    Tells whether the automatic backup is due. It is due from the backup date onwards, so a backup
+    missed while the app was not running is made the next time it runs.
+
+    :return: True if the backup is due, else False.
+    """
+    return strftime("%Y-%m-%d") >= str(get_settings()["backup date"])
+
+
+class BackupThread(ExportDataThread):
+    """
+    Makes the automatic backup away from the GUI thread: exports the changed attendance records
+    as daily files and takes a snapshot of all the data.
+    """
+
+    def __init__(self):
+        super().__init__(EXPORT_FOLDER_PATH)
+
+        self._failed = False
+
+    def has_failed(self) -> bool:
+        """
+        Tells whether the backup could not be completed.
+
+        :return: True if the backup failed, else False.
+        """
+        return self._failed
+
+    def run(self):
+        """Makes the backup on a connection of its own."""
+        # Try to make the backup.
+        try:
+            os.makedirs(EXPORT_FOLDER_PATH, exist_ok=True)
+
+            super().run()
+            create_snapshot()
+
+        # If an error occurs, it means that the database or the disk could not be used right now.
+        # So the backup will be tried again later.
+        except (DatabaseError, OSError):
+            self._failed = True
+
+
+class ScreenDataThread(QtCore.QThread):
+    """
+    Reads the data of the screens of the main window in the background, while the screen shown first
+    is in use, so that the other screens are quick to set up when they are first shown.
+    The data of the Class and Settings screens is kept in memory already, so it is not read here.
+    """
+
+    def __init__(self, date: str, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self.date = date
+
+        # The data read, by key. Each item is taken by the screen which uses it.
+        self.data = dict()
+
+    def run(self):
+        """Reads the data on a connection of its own."""
+        # Try to read the data, stopping if it is discarded meanwhile.
+        try:
+            with data_storage.connection() as cursor:
+                reads = [
+                    (("attendance recorded", self.date), is_attendance_recorded, self.date),
+                    (("daily report", self.date), get_daily_report, self.date),
+                    (("student report",), get_student_report)
+                ]
+                for key, read, *arguments in reads:
+                    if self.isInterruptionRequested():
+                        return
+
+                    self.data[key] = read(*arguments, cursor)
+
+                # The present and absent lists exist only if the daily report does.
+                if self.data[("daily report", self.date)] is not None:
+                    self.data[("attendance record", self.date)] = get_attendance_record(self.date, cursor)
+
+        # If an error occurs, it means that the database could not be used right now.
+        # So the screens read their data when they are set up.
+        except DatabaseError:
+            self.data.clear()
+
+    def discard(self):
+        """Discards the data read, as it is out of date once the data is changed."""
+        self.requestInterruption()
+        self.wait()
+        self.data.clear()
+
+
+class BackupScheduler(QtCore.QObject):
+    """
+    Runs the automatic backup on a BackupThread once the main window is ready to use, so that starting
+    the app takes as long on the backup date as on any other day.
+    The next backup date, kept in the settings, is the state of the scheduler. It moves ahead by the backup
+    frequency only after a backup succeeds. A failed backup is tried again after RETRY_DELAY, up to
+    MAXIMUM_ATTEMPTS times, and then on the next start of the app.
+    """
+
+    # Delays in milliseconds.
+    START_DELAY = 5000
+    RETRY_DELAY = 5 * 60 * 1000
+
+    MAXIMUM_ATTEMPTS = 3
+
+    def __init__(self, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self._backup_thread = None
+        self._attempts = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.run_if_due)
+
+    def start(self):
+        """Schedules the first check for a due backup."""
+        self._timer.start(self.START_DELAY)
+
+    def run_if_due(self):
+        """Starts the backup if it is due."""
+        if self._backup_thread is not None or not is_backup_due():
+            return
+
+        self._attempts += 1
+
+        self._backup_thread = BackupThread()
+        self._backup_thread.finished.connect(self.finish)
+        self._backup_thread.start()
+
+    def finish(self):
+        """Moves the backup date ahead after a successful backup, or schedules another attempt."""
+        failed = self._backup_thread.has_failed()
+        self._backup_thread = None
+
+        if failed:
+            if self._attempts < self.MAXIMUM_ATTEMPTS:
+                self._timer.start(self.RETRY_DELAY)
+        else:
+            self._attempts = 0
+
+            backup_frequency = get_settings()["backup frequency"]
+            save_setting("backup date", get_date_after(BACKUP_FREQUENCY_DAYS[backup_frequency]))
+
+    def stop(self):
+        """Cancels any scheduled backup and waits for a running backup to complete."""
+        self._timer.stop()
+
+        if self._backup_thread is not None:
+            self._backup_thread.wait()
+
+
 class EditClassDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/EditClassDialog_ui.ui", self)
+        load_ui("src/layout/EditClassDialog_ui.ui", self)
 
         self._action = None
 
@@ -1522,6 +4798,18 @@ class EditClassDialog(QtWidgets.QDialog):
         self.rename_student_button.clicked.connect(self.rename_student)
         self.cancel_rename_page_button.clicked.connect(self.close)
 
+    def reset_state(self):
+        """Makes the dialog ready to be shown again."""
+        self._action = None
+
+        self.name_add_page_line_edit.clear()
+        self.roll_number_remove_page_line_edit.clear()
+        self.roll_number_rename_page_line_edit.clear()
+        self.new_name_rename_page_line_edit.clear()
+
+        self.edit_class_combo_box.setCurrentIndex(0)
+        self.switch_page()
+
     def get_action(self) -> str:
         """
         Tells the current edit action. The various edit actions are
@@ -1537,110 +4825,95 @@ class EditClassDialog(QtWidgets.QDialog):
 
     def add_student(self):
         """Adds a student to the Class if the student does not exist."""
-        use_information_database()
-
         name = self.name_add_page_line_edit.text().strip().title()
 
-        if name != "":
-            try:
-                add_query = f"INSERT INTO paper_student_list_table VALUES ('{name}')"
-                data_cursor.execute(add_query)
+        if name != "" and student_roster.get_roll_number(name) is None:
+            # A new student always gets a new "id", even if a student of the same name was removed from the Class
+            # before, so that they do not take over the attendance records and reports of that student.
+            add_query = "INSERT INTO paper_information_database.paper_student_list_table (name, enrolled) " \
+                        "VALUES (%s, 1)"
+            data_cursor.execute(add_query, (name,))
 
-                self._action = "add"
-                self.close()
-            except server.IntegrityError:
-                self.close()
+            # The names of the enrolled students are unique, so the new student is the only one found.
+            get_student_id_query = "SELECT id FROM paper_information_database.paper_student_list_table " \
+                                   "WHERE name = %s AND enrolled = 1"
+            data_cursor.execute(get_student_id_query, (name,))
+            student_roster.add(name, data_cursor.fetchone()[0])
 
-                duplicate_student_error_dialog = DuplicateStudentErrorDialog()
-                duplicate_student_error_dialog.exec()
+            self._action = "add"
+            self.close()
+
+        elif name != "":
+            self.close()
+
+            duplicate_student_error_dialog = get_dialog(DuplicateStudentErrorDialog)
+            duplicate_student_error_dialog.exec()
 
     def remove_student(self):
         """Removes the desired student from the Class if the entered roll number is correct."""
-        use_information_database()
-
-        student_list = get_student_list()
         roll_number = self.roll_number_remove_page_line_edit.text().strip()
 
-        if roll_number.isdigit() and 0 < int(roll_number) <= len(student_list):
-            student_name = student_list[int(roll_number) - 1]
+        if roll_number.isdigit() and student_roster.get_name(int(roll_number)) is not None:
+            student_name = student_roster.get_name(int(roll_number))
 
-            remove_query = "DELETE FROM paper_student_list_table " \
-                           f"WHERE name = '{student_name}'"
-            data_cursor.execute(remove_query)
-
-            # Try to remove student from individual student report.
-            try:
-                use_reports_database()
-                remove_from_individual_student_report_query = "DELETE FROM paper_student_report_table " \
-                                                              f"WHERE name = '{student_name}'"
-                data_cursor.execute(remove_from_individual_student_report_query)
-
-            # If an error occurs, it means that the individual student report list is empty
-            # because no attendance has been recorded till now.
-            # Do nothing.
-            except server.ProgrammingError:
-                pass
+            # The student keeps their row, so that their attendance records and reports keep referring to them.
+            # Their report is no longer shown.
+            remove_query = "UPDATE paper_information_database.paper_student_list_table " \
+                           "SET enrolled = 0 " \
+                           "WHERE id = %s"
+            data_cursor.execute(remove_query, (student_roster.get_student_id(student_name),))
+            student_roster.remove(student_name)
 
             self._action = "remove"
             self.close()
         else:
             self.close()
 
-            roll_number_not_found_error_dialog = RollNumberNotFoundErrorDialog()
+            roll_number_not_found_error_dialog = get_dialog(RollNumberNotFoundErrorDialog)
             roll_number_not_found_error_dialog.exec()
 
     def rename_student(self):
         """Renames the student if the entered roll number is correct."""
-        student_list = get_student_list()
-
         roll_number = self.roll_number_rename_page_line_edit.text().strip()
         new_name = self.new_name_rename_page_line_edit.text().strip().title()
 
-        if roll_number.isdigit() and 0 < int(roll_number) <= len(student_list) and new_name != "":
-            old_name = student_list[int(roll_number) - 1]
-
-            try:
-                use_information_database()
-                rename_query = "UPDATE paper_student_list_table " \
-                               f"SET name = '{new_name}' " \
-                               f"WHERE name = '{old_name}'"
-                data_cursor.execute(rename_query)
+        if roll_number.isdigit() and student_roster.get_name(int(roll_number)) is not None and new_name != "":
+            old_name = student_roster.get_name(int(roll_number))
+            student_id = student_roster.get_student_id(old_name)
 
-                # Try to rename student in individual student report.
-                try:
-                    use_reports_database()
-                    rename_query = "UPDATE paper_student_report_table " \
-                                   f"SET name = '{new_name}' " \
-                                   f"WHERE name = '{old_name}'"
-                    data_cursor.execute(rename_query)
+            # The name must not be taken by another student of the Class. The students removed from the Class
+            # do not count.
+            if student_roster.get_roll_number(new_name) not in (None, int(roll_number)):
+                self.close()
 
-                # If an error occurs, it means that the individual student report list is empty
-                # because no attendance has been recorded till now.
-                # Do nothing.
-                except server.ProgrammingError:
-                    pass
+                duplicate_student_error_dialog = get_dialog(DuplicateStudentErrorDialog)
+                duplicate_student_error_dialog.exec()
+                return
 
-                rename_student_in_past_records(old_name, new_name)
+            # The attendance records and the reports refer to the student by "id",
+            # so only the row of the student in the list of students changes.
+            rename_query = "UPDATE paper_information_database.paper_student_list_table " \
+                           "SET name = %s " \
+                           "WHERE id = %s"
+            data_cursor.execute(rename_query, (new_name, student_id))
+            student_roster.rename(old_name, new_name)
 
-                self._action = "rename"
-                self.close()
-            except server.IntegrityError:
-                self.close()
+            mark_student_records_changed(student_id)
 
-                duplicate_student_error_dialog = DuplicateStudentErrorDialog()
-                duplicate_student_error_dialog.exec()
+            self._action = "rename"
+            self.close()
 
         else:
             self.close()
 
-            roll_number_not_found_error_dialog = RollNumberNotFoundErrorDialog()
+            roll_number_not_found_error_dialog = get_dialog(RollNumberNotFoundErrorDialog)
             roll_number_not_found_error_dialog.exec()
 
 
 class DuplicateStudentErrorDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/DuplicateStudentErrorDialog_ui.ui", self)
+        load_ui("src/layout/DuplicateStudentErrorDialog_ui.ui", self)
 
         self.close_button.clicked.connect(self.close)
 
@@ -1648,13 +4921,17 @@ class DuplicateStudentErrorDialog(QtWidgets.QDialog):
 class SaveAttendanceConfirmationDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/SaveAttendanceConfirmationDialog_ui.ui", self)
+        load_ui("src/layout/SaveAttendanceConfirmationDialog_ui.ui", self)
 
         self._action = None
 
         self.no_button.clicked.connect(self.close)
         self.yes_button.clicked.connect(self.confirm_save)
 
+    def reset_state(self):
+        """Makes the dialog ready to be shown again."""
+        self._action = None
+
     def get_action(self) -> str:
         """
         Tells whether the user chose to save attendance or not.
@@ -1672,9 +4949,10 @@ class SaveAttendanceConfirmationDialog(QtWidgets.QDialog):
 class EditAttendanceDataDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/EditAttendanceDataDialog_ui.ui", self)
+        load_ui("src/layout/EditAttendanceDataDialog_ui.ui", self)
 
         self._action = None
+        self._edited_date = None
 
         raw_date = get_date()[1]
         self.attendance_data_date_edit.setDate(QtCore.QDate(raw_date[2], raw_date[1], raw_date[0]))
@@ -1683,6 +4961,16 @@ class EditAttendanceDataDialog(QtWidgets.QDialog):
         self.cancel_button.clicked.connect(self.close)
         self.edit_button.clicked.connect(self.edit_data)
 
+    def reset_state(self):
+        """Makes the dialog ready to be shown again."""
+        self._action = None
+        self._edited_date = None
+
+        raw_date = get_date()[1]
+        self.attendance_data_date_edit.setDate(QtCore.QDate(raw_date[2], raw_date[1], raw_date[0]))
+        self.roll_number_line_edit.clear()
+        self.state_combo_box.setCurrentIndex(0)
+
     def get_action(self) -> str:
         """
         Tells whether the user edited attendance data or not.
@@ -1691,12 +4979,20 @@ class EditAttendanceDataDialog(QtWidgets.QDialog):
         """
         return self._action
 
+    def get_edited_date(self) -> str or None:
+        """
+        Tells the date whose attendance data was edited.
+
+        :return: The date, if the user edited attendance data, else None.
+        """
+        return self._edited_date
+
     def edit_data(self) -> str or None:
         """Edits attendance data."""
         selected_date = self.attendance_data_date_edit.text().split("-")
         selected_date = "_".join(str(int(i)) for i in selected_date)
 
-        student_list = get_student_list(selected_date)
+        attendance_record = get_record_states(selected_date)
 
         provided_roll_number = self.roll_number_line_edit.text().strip()
         state_position = self.state_combo_box.currentIndex()
@@ -1706,81 +5002,93 @@ class EditAttendanceDataDialog(QtWidgets.QDialog):
         else:
             state = "A"
 
-        try:
-            use_attendance_database()
-
-            test_for_attendance_record_query = f"SELECT * FROM {selected_date}"
-            data_cursor.execute(test_for_attendance_record_query)
+        # If the attendance has not been recorded for the selected date, there is no data to edit.
+        if not attendance_record:
+            self.close()
 
-            if provided_roll_number.isdigit() and 0 < int(provided_roll_number) <= len(student_list):
-                student_name = student_list[int(provided_roll_number) - 1]
-                get_current_state_query = f"SELECT state FROM {selected_date} " \
-                                          f"WHERE name = '{student_name}'"
+            no_data_found_error_dialog = get_dialog(NoDataFoundErrorDialog)
+            no_data_found_error_dialog.exec()
 
-                data_cursor.execute(get_current_state_query)
-                current_state = data_cursor.fetchone()[0]
+        elif provided_roll_number.isdigit() and 0 < int(provided_roll_number) <= len(attendance_record):
+            student_name, student_id, current_state = attendance_record[int(provided_roll_number) - 1]
 
-                if state == "P":
-                    update_data_query = f"UPDATE {selected_date} " \
-                                        "SET state = 'P' " \
-                                        f"WHERE name = '{student_name}'"
-                else:
-                    update_data_query = f"UPDATE {selected_date} " \
-                                        "SET state = 'A' " \
-                                        f"WHERE name = '{student_name}'"
+            update_data_query = "UPDATE paper_attendance_database.paper_attendance_table " \
+                                "SET state = %s " \
+                                "WHERE date = %s AND student_id = %s"
+            data_cursor.execute(update_data_query, (state, selected_date, student_id))
 
-                data_cursor.execute(update_data_query)
+            if state == "P":
+                # If the student was previously marked absent, only then update the individual
+                # student report by adding 1 to the number of days present.
+                if current_state == "A":
+                    update_student_report_query = "UPDATE paper_reports_database.paper_student_report_table " \
+                                                  "SET days_present = days_present + 1 " \
+                                                  "WHERE student_id = %s"
+                    data_cursor.execute(update_student_report_query, (student_id,))
+                    change_period_reports(selected_date, student_id, 1)
 
-                use_reports_database()
+            else:
+                # If the student was previously marked present, only then update the individual
+                # student report by subtracting 1 from the number of days present.
+                if current_state == "P":
+                    update_student_report_query = "UPDATE paper_reports_database.paper_student_report_table " \
+                                                  "SET days_present = days_present - 1 " \
+                                                  "WHERE student_id = %s"
+                    data_cursor.execute(update_student_report_query, (student_id,))
+                    change_period_reports(selected_date, student_id, -1)
+
+            write_daily_report(selected_date)
+            mark_record_changed(selected_date)
+
+            self._action = "edit attendance"
+            self._edited_date = selected_date
+            self.close()
 
-                if state == "P":
-                    # If the student was previously marked absent, only then update the individual
-                    # student report by adding 1 to the number of days present.
-                    if current_state == "A":
-                        update_student_report_query = "UPDATE paper_student_report_table " \
-                                                      "SET days_present = days_present + 1 " \
-                                                      f"WHERE name = '{student_name}'"
-                        data_cursor.execute(update_student_report_query)
+        else:
+            self.close()
 
-                else:
-                    # If the student was previously marked present, only then update the individual
-                    # student report by subtracting 1 from the number of days present.
-                    if current_state == "P":
-                        update_student_report_query = "UPDATE paper_student_report_table " \
-                                                      "SET days_present = days_present - 1 " \
-                                                      f"WHERE name = '{student_name}'"
-                        data_cursor.execute(update_student_report_query)
+            roll_number_not_found_error_dialog = get_dialog(RollNumberNotFoundErrorDialog)
+            roll_number_not_found_error_dialog.exec()
 
-                write_daily_report(selected_date)
 
-                self._action = "edit attendance"
-                self.close()
+class NoDataFoundErrorDialog(QtWidgets.QDialog):
+    def __init__(self):
+        super().__init__()
+        load_ui("src/layout/NoDataFoundErrorDialog_ui.ui", self)
 
-            else:
-                self.close()
+        self.close_button.clicked.connect(self.close)
 
-                roll_number_not_found_error_dialog = RollNumberNotFoundErrorDialog()
-                roll_number_not_found_error_dialog.exec()
 
-        except server.ProgrammingError:
-            self.close()
+class RestoreFailedErrorDialog(QtWidgets.QDialog):
+    def __init__(self):
+        super().__init__()
+        load_ui("src/layout/RestoreFailedErrorDialog_ui.ui", self)
 
-            no_data_found_error_dialog = NoDataFoundErrorDialog()
-            no_data_found_error_dialog.exec()
+        self.close_button.clicked.connect(self.close)
 
 
-class NoDataFoundErrorDialog(QtWidgets.QDialog):
+class UndoFailedErrorDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/NoDataFoundErrorDialog_ui.ui", self)
+        load_ui("src/layout/UndoFailedErrorDialog_ui.ui", self)
 
         self.close_button.clicked.connect(self.close)
 
+    def set_file_path(self, file_path: str):
+        """
+        Tells the user which snapshot holds the data as it was before the restore.
+
+        :param file_path: Path of the snapshot.
+        """
+        self.message_label.setText("The chosen file could not be restored, and your data could not be put back "
+                                   "as it was. Your data as it was before is kept in "
+                                   f"\"{os.path.basename(file_path)}\", restore it to try again.")
+
 
 class RollNumberNotFoundErrorDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/RollNumberNotFoundErrorDialog_ui.ui", self)
+        load_ui("src/layout/RollNumberNotFoundErrorDialog_ui.ui", self)
 
         self.close_button.clicked.connect(self.close)
 
@@ -1788,15 +5096,66 @@ class RollNumberNotFoundErrorDialog(QtWidgets.QDialog):
 class SettingsSavedMessageDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/SettingsSavedMessageDialog_ui.ui", self)
+        load_ui("src/layout/SettingsSavedMessageDialog_ui.ui", self)
+
+        self.close_button.clicked.connect(self.close)
+
+
+class ReportsCheckedMessageDialog(QtWidgets.QDialog):
+    def __init__(self):
+        super().__init__()
+        load_ui("src/layout/ReportsCheckedMessageDialog_ui.ui", self)
+
+        self._action = None
 
+        self.repair_button.clicked.connect(self.repair)
         self.close_button.clicked.connect(self.close)
 
+    def reset_state(self):
+        """Makes the dialog ready to be shown again."""
+        self._action = None
+
+    def get_action(self) -> str:
+        """
+        Tells whether the user chose to repair the reports or not.
+
+        :return: String "repair reports" if user chose to repair the reports.
+        """
+        return self._action
+
+    def repair(self):
+        """Confirms repairing the reports."""
+        self._action = "repair reports"
+        self.close()
+
+    def set_message(self, names: list):
+        """
+        Tells the user which student reports differ from the attendance records.
+        The reports can be repaired only if any of them differs.
+
+        :param names: Names of the students whose report differs.
+        """
+        self.repair_button.setVisible(len(names) > 0)
+
+        # Only the first few students are named, so that the message fits.
+        listed_names = ", ".join(names[:3])
+        if len(names) > 3:
+            listed_names += f" and {len(names) - 3} more"
+
+        if len(names) == 0:
+            self.message_label.setText("The reports match the attendance records.")
+        elif len(names) == 1:
+            self.message_label.setText(f"The report of {listed_names} differs from the attendance records. "
+                                       "Repair it to count it again from the records.")
+        else:
+            self.message_label.setText(f"The reports of {len(names)} students differ from the attendance records: "
+                                       f"{listed_names}. Repair them to count them again from the records.")
+
 
 class ResetSettingsConfirmationDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/ResetSettingsConfirmationDialog_ui.ui", self)
+        load_ui("src/layout/ResetSettingsConfirmationDialog_ui.ui", self)
 
         self._action = None
 
@@ -1820,16 +5179,16 @@ class ResetSettingsConfirmationDialog(QtWidgets.QDialog):
 class CreditsDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/CreditsDialog_ui.ui", self)
+        load_ui("src/layout/CreditsDialog_ui.ui", self)
 
 
 class LicenseTermsDialog(QtWidgets.QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi("src/layout/LicenseTermsDialog_ui.ui", self)
+        load_ui("src/layout/LicenseTermsDialog_ui.ui", self)
 
 
 if __name__ == "__main__":
-    application = QtWidgets.QApplication(sys.argv)
+    application = QtWidgets.QApplication(argv)
     main_window = MainWindow()
     application.exec()
@@ -0,0 +1,98 @@
+# Paper - Digital Attendance Management System
+#     Copyright (C) 2022-2023  Saurabh Kumar
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU Affero General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU Affero General Public License for more details.
+#
+#     You should have received a copy of the GNU Affero General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact: Saurabh Kumar <developer.saurabh@outlook.com>
+#
+
+"""
+Prints the time taken to import main.py, and the modules which take the longest to import,
+as measured by "python -X importtime". This is the cold-start cost paid before the first window appears.
+
+Usage: python profile_imports.py [--top N] [--budget MILLISECONDS]
+
+With --budget, the script exits with status 1 if importing main.py takes longer than the budget,
+so that it can be used to catch startup regressions.
+"""
+
+import argparse
+import os.path
+import subprocess
+import sys
+
+
+def profile_imports() -> list:
+    """
+    Imports main.py in a new Python process and reads the import times it reports.
+
+    :return: List of (cumulative time, self time, module name, depth) for every imported module, in microseconds.
+    """
+    app_folder_path = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=app_folder_path, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing main.py failed:\n{result.stderr[-2000:]}")
+
+    imports = list()
+
+    # Every line is "import time: <self time> | <cumulative time> | <module name>", where the name
+    # is indented by two spaces for every level of nesting. The first line is the header.
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_time, cumulative_time, module_name = line[len("import time:"):].split("|")
+        depth = (len(module_name) - len(module_name.lstrip()) - 1) // 2
+        imports.append((int(cumulative_time), int(self_time), module_name.strip(), depth))
+
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profiles the time taken to import main.py.")
+    parser.add_argument("--top", type=int, default=15, help="number of modules to list (default: 15)")
+    parser.add_argument("--budget", type=float, help="fail if importing main.py takes longer, in milliseconds")
+    arguments = parser.parse_args()
+
+    imports = profile_imports()
+
+    # The modules imported by the interpreter itself at startup are at the top level too, so only main.py is
+    # counted. Every module is reported after the modules it imports, so the modules imported for main.py
+    # are the ones reported between the previous top level module and main.py.
+    main_position = [(item[2], item[3]) for item in imports].index(("main", 0))
+    first_position = main_position
+    while first_position > 0 and imports[first_position - 1][3] > 0:
+        first_position -= 1
+
+    main_imports = imports[first_position:main_position + 1]
+    total_time = imports[main_position][0] / 1000
+
+    # The modules imported directly by main.py are listed too, as they show where its time goes.
+    listed_imports = sorted((item for item in main_imports if item[3] <= 1), reverse=True)
+
+    print(f"{'Cumulative [ms]':>16} {'Self [ms]':>10}  Module")
+    for cumulative_time, self_time, module_name, depth in listed_imports[:arguments.top]:
+        print(f"{cumulative_time / 1000:16.1f} {self_time / 1000:10.1f}  {'  ' * depth}{module_name}")
+
+    print(f"\nTotal import time: {total_time:.1f} ms ({len(main_imports)} modules)")
+
+    if arguments.budget is not None and total_time > arguments.budget:
+        print(f"Import time is over the budget of {arguments.budget:.1f} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
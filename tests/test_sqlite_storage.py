@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The app needs mysql.connector only when it keeps its data on the MySQL Server.
+os.environ["PAPER_STORAGE_ENGINE"] = "sqlite"
+
+from main import SQLiteStorageEngine
+
+# Script run in a process of its own, which writes to two databases in one transaction and is then
+# killed before the transaction is committed.
+KILLED_WRITER = """
+import os
+import sys
+
+sys.path.insert(0, sys.argv[2])
+
+from main import SQLiteStorageEngine
+
+engine = SQLiteStorageEngine(sys.argv[1])
+cursor = engine.cursor()
+
+engine.start_transaction()
+cursor.execute("INSERT INTO first_database.numbers VALUES (2)")
+cursor.execute("INSERT INTO second_database.numbers VALUES (2)")
+os._exit(1)
+"""
+
+
+class SQLiteStorageEngineTest(unittest.TestCase):
+    """Checks that a transaction writing to several databases of the SQLite engine is applied all at once."""
+
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+
+        engine = SQLiteStorageEngine(self.folder_path)
+        for database in ["first_database", "second_database"]:
+            engine.create_database(database)
+            engine.cursor().execute(f"CREATE TABLE {database}.numbers (number int)")
+
+    def count_numbers(self) -> tuple:
+        """
+        Counts the rows of both the databases on a new engine, as another run of the app would find them.
+
+        :return: Number of rows in the first and in the second database.
+        """
+        engine = SQLiteStorageEngine(self.folder_path)
+        cursor = engine.cursor()
+
+        counts = list()
+        for database in ["first_database", "second_database"]:
+            cursor.execute(f"SELECT count(*) FROM {database}.numbers")
+            counts.append(cursor.fetchone()[0])
+
+        return tuple(counts)
+
+    def test_databases_share_one_file(self):
+        database_files = [file_name for file_name in os.listdir(self.folder_path) if file_name.endswith(".db")]
+        self.assertEqual(database_files, [SQLiteStorageEngine.FILE_NAME])
+
+    def test_committed_transaction_writes_both_databases(self):
+        engine = SQLiteStorageEngine(self.folder_path)
+        cursor = engine.cursor()
+
+        engine.start_transaction()
+        cursor.execute("INSERT INTO first_database.numbers VALUES (1)")
+        cursor.execute("INSERT INTO second_database.numbers VALUES (1)")
+        engine.commit()
+
+        self.assertEqual(self.count_numbers(), (1, 1))
+
+    def test_killed_transaction_writes_neither_database(self):
+        root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.run([sys.executable, "-c", KILLED_WRITER, self.folder_path, root_path])
+
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(self.count_numbers(), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()